@@ -4,4 +4,6 @@ __version__ = "1.0.0"
 
 from .spreadsheet import Spreadsheet
 from .worksheet import Worksheet
+from .entry import Entry
+from .backends import GSheetsBackend, SQLiteBackend
 from .utils import *
\ No newline at end of file
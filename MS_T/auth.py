@@ -3,7 +3,6 @@ import random
 import string
 import time
 import getpass
-import gspread
 from .utils import re_dirname
 
 dirpath = re_dirname(os.path.dirname(__file__), 1)
@@ -19,6 +18,8 @@ def get_worksheetID():
             return file.readline().strip('\n')
         
 def authorize():
+    import gspread
+
     credentials_path = os.path.join(dirpath, 'credentials.json')
     authorized_user = os.path.join(dirpath, 'authorized_user.json')
 
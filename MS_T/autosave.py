@@ -0,0 +1,99 @@
+import atexit
+import threading
+
+# Flush queued changes after this many seconds...
+AUTOSAVE_INTERVAL = 30
+# ...or as soon as this many mutations are waiting
+AUTOSAVE_MAX_PENDING = 100
+# Longest wait between retries while saving keeps failing (the wait doubles from interval)
+AUTOSAVE_MAX_BACKOFF = 600
+
+class AutoSaver:
+    def __init__(self, spreadsheet, interval=AUTOSAVE_INTERVAL, max_pending=AUTOSAVE_MAX_PENDING, max_backoff=AUTOSAVE_MAX_BACKOFF) -> None:
+        ''' Write-behind saving of a Spreadsheet from a background thread
+
+        Worksheet mutations are queued as dirty rows (see Worksheet.pending_changes)
+        and counted with changed(), the thread flushes them in one coalesced
+        Spreadsheet.save every interval seconds or once max_pending mutations are
+        waiting. After a failed flush it waits interval seconds, doubling up to
+        max_backoff while failures continue. Pending changes are flushed at exit.
+        '''
+
+        self.spreadsheet = spreadsheet
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_backoff = max_backoff
+        self.pending = 0
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def start(self):
+        if self.thread:
+            return self
+
+        self.thread = threading.Thread(target=self.run, name='autosave', daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def changed(self, n=1):
+        ''' Counts n queued mutations, waking the flusher once max_pending is reached '''
+
+        with self.condition:
+            self.pending += n
+
+            if self.pending >= self.max_pending:
+                self.condition.notify()
+
+    def saved(self):
+        ''' Called by Spreadsheet.save, everything queued so far has been written '''
+
+        with self.condition:
+            self.pending = 0
+
+    def run(self):
+        delay = None
+
+        while True:
+            with self.condition:
+                if delay:
+                    # Retrying a failed flush, only stopping cuts the wait short
+                    self.condition.wait_for(lambda: self.stopped, timeout=delay)
+                else:
+                    self.condition.wait_for(lambda: self.stopped or self.pending >= self.max_pending, timeout=self.interval)
+
+                if self.stopped:
+                    return
+
+                if not self.pending:
+                    continue
+
+            if self.flush():
+                delay = None
+            else:
+                delay = min(delay * 2 if delay else self.interval, max(self.interval, self.max_backoff))
+
+    def flush(self):
+        ''' Saves pending changes, returns True on success '''
+
+        try:
+            return self.spreadsheet.save()
+        except Exception as e:
+            # Rows stay dirty, the next flush retries them
+            print(f"Error: Autosave failed\n{e}")
+
+    def stop(self):
+        ''' Stops the flusher and writes whatever is still queued '''
+
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+        atexit.unregister(self.stop)
+
+        if self.pending:
+            self.flush()
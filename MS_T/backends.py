@@ -0,0 +1,481 @@
+''' Storage backends used by Spreadsheet
+
+A backend provides:
+    id, title, url
+    sheets() -> [(title, native worksheet or None)]
+    modified_time() -> stamp that changes whenever stored data changes
+    read_all(titles) -> {title: [title row, *value rows]}
+    write_titles(titles) -> rewrites title rows
+    write_changes(changes) -> applies {title: Worksheet.pending_changes()} as one batch
+
+Optional, for incremental loads:
+    probe(titles) -> {title: {'rows': #, 'blocks': {block #: version}}} (blocks of SYNC_BLOCK rows)
+    read_blocks(blocks) -> {title: {block #: [value rows]}} for blocks {title: [block #]}
+'''
+
+from .auth import (
+    authorize,
+    get_worksheetID,
+    unique_sheetname,
+    save_worksheetID
+)
+from .entry import ROW_TITLES
+from .stats import instrument
+import os
+import re
+import sqlite3
+
+MAX_SHEET_ROWS = 50000
+# Rows per block for change probes
+SYNC_BLOCK = 1000
+# Continuation sheets of a worksheet are named "<title>#2", "<title>#3", ...
+shard_pattern = re.compile(r'^(.*)#(\d+)$')
+# Same format as gspread Spreadsheet.url
+SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/%s'
+DEFAULT_SHEET_TITLES = ['Planned', 'Available', 'Watched', 'Canceled']
+db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library.sqlite3')
+cell_titlerow_format = {
+    'backgroundColor': {
+        'red': 249/255,
+        'green': 203/255,
+        'blue': 156/255
+    },
+    'horizontalAlignment': 'CENTER',
+    'textFormat': {
+        'bold': True
+    }
+}
+
+def shard_title(title, n):
+    return title if n == 0 else f'{title}#{n+1}'
+
+class GSheetsBackend:
+    def __init__(self, client=None, spreadsheet=None, shard_rows=MAX_SHEET_ROWS-1) -> None:
+        ''' Google Sheets storage through gspread
+
+        Uses spreadsheet, or authorizes and opens the saved spreadsheet ID (or a newly
+        created spreadsheet) when first needed.
+
+        Worksheets hold up to shard_rows data rows each, longer worksheets continue in
+        "<title>#2", "<title>#3", ... (created when needed). Titles and positions used
+        by the other methods are logical, shards are read and written in the same
+        batched request.
+        '''
+
+        self._client = instrument(client, 'client')
+        self._g = instrument(spreadsheet, 'spreadsheet')
+        self.shard_rows = shard_rows
+        self.shards = None
+
+    @property
+    def client(self):
+        ''' Authorized gspread client, authorizes on first use '''
+
+        if self._client is None:
+            self._client = instrument(authorize(), 'client')
+
+        return self._client
+
+    @property
+    def g(self):
+        ''' Opens the saved spreadsheet ID or a newly created spreadsheet on first use '''
+
+        if self._g is None:
+            sheetID = get_worksheetID()
+
+            if sheetID:
+                self._g = instrument(self.client.open_by_key(sheetID), 'spreadsheet')
+            else:
+                self._g = instrument(self.new_spreadsheet(), 'spreadsheet')
+
+                save_worksheetID(self._g.id)
+
+        return self._g
+
+    @property
+    def id(self):
+        # Known without opening the spreadsheet once an ID is saved
+        return self._g.id if self._g is not None else get_worksheetID() or self.g.id
+
+    @property
+    def title(self):
+        return self.g.title
+
+    @property
+    def url(self):
+        return self._g.url if self._g is not None else SPREADSHEET_URL % self.id
+
+    @staticmethod
+    def format_wk(worksheet):
+        worksheet.format('A1:Z1', cell_titlerow_format)
+        worksheet.freeze(rows=1)
+
+    def new_spreadsheet(self):
+        title = f'Movie/Show Tracker - {unique_sheetname()}'
+
+        created_spreadsheet = self.client.create(title=title)
+
+        def new_wk(title):
+            worksheet = created_spreadsheet.add_worksheet(title=title, cols=15, rows=MAX_SHEET_ROWS)
+            self.format_wk(worksheet)
+
+        s1 = created_spreadsheet.sheet1
+        s1.add_rows(MAX_SHEET_ROWS-s1.row_count)
+        s1.update_title(DEFAULT_SHEET_TITLES[0])
+        self.format_wk(s1)
+
+        for i in DEFAULT_SHEET_TITLES[1:]:
+            new_wk(i)
+
+        return created_spreadsheet
+
+    def sheets(self):
+        ''' Wraps the worksheets from a single metadata request, continuation sheets grouped under their worksheet '''
+
+        shards, handles = {}, {}
+
+        for i in self.g.worksheets():
+            match = shard_pattern.match(i.title)
+            title, n = (match.group(1), int(match.group(2)) - 1) if match else (i.title, 0)
+
+            shards.setdefault(title, {})[n] = i.title
+            handles.setdefault(title, {})[n] = i
+
+        self.shards = {t: [v[n] for n in sorted(v)] for t, v in shards.items()}
+
+        return [(t, instrument(handles[t][min(handles[t])], 'worksheet')) for t in self.shards]
+
+    def shards_of(self, title):
+        if self.shards is None:
+            self.sheets()
+
+        return self.shards.get(title) or [title]
+
+    def add_shards(self, title, count):
+        ''' Creates continuation sheets until title has count shards '''
+
+        shards = self.shards_of(title)
+
+        for n in range(len(shards), count):
+            worksheet = self.g.add_worksheet(title=shard_title(title, n), rows=MAX_SHEET_ROWS, cols=15)
+            self.format_wk(worksheet)
+            shards.append(worksheet.title)
+
+        self.shards[title] = shards
+        self.write_titles_to(shards)
+
+    def split(self, title, start, rows):
+        ''' Yields (shard title, first sheet row, rows) for logical rows from position start '''
+
+        shards = self.shards_of(title)
+
+        while rows:
+            n, offset = divmod(start, self.shard_rows)
+            count = min(len(rows), self.shard_rows - offset)
+
+            yield shards[n], offset + 2, rows[:count]
+
+            start += count
+            rows = rows[count:]
+
+    def modified_time(self):
+        ''' Returns spreadsheet modifiedTime (drive metadata) '''
+
+        if hasattr(self.g, 'get_lastUpdateTime'):
+            return self.g.get_lastUpdateTime()
+
+        return self.g.lastUpdateTime
+
+    def read_all(self, titles):
+        ''' Reads every worksheet in one batched values request '''
+
+        from gspread.utils import absolute_range_name
+
+        ranges = [(t, n, shard) for t in titles for n, shard in enumerate(self.shards_of(t))]
+        value_ranges = self.g.values_batch_get([absolute_range_name(shard) for *_, shard in ranges]).get('valueRanges', [])
+        values = {}
+
+        for (title, n, _), value_range in zip(ranges, value_ranges):
+            rows = value_range.get('values', [])
+
+            if n == 0:
+                values[title] = rows
+                continue
+
+            # Pad the previous shard so rows keep their logical positions
+            if len(rows) > 1:
+                values[title].extend([[]] * (n * self.shard_rows + 1 - len(values[title])))
+                values[title].extend(rows[1:])
+
+        return values
+
+    def write_titles(self, titles):
+        self.write_titles_to([shard for t in titles for shard in self.shards_of(t)])
+
+    def write_titles_to(self, sheet_titles):
+        from gspread.utils import absolute_range_name
+
+        title_row = list(ROW_TITLES) + [''] * (26 - len(ROW_TITLES))
+
+        self.g.values_batch_update({
+            'valueInputOption': 'RAW',
+            'data': [{'range': absolute_range_name(t, 'A1:Z1'), 'values': [title_row]} for t in sheet_titles]
+        })
+
+    def write_changes(self, changes):
+        ''' Writes changed row spans and blanks rows past the end, in one batched values request '''
+
+        from gspread.utils import absolute_range_name, rowcol_to_a1
+
+        width = len(ROW_TITLES)
+        data = []
+
+        for title, change in changes.items():
+            spans = list(change['spans'])
+
+            if change['synced_rows'] > change['size']:
+                spans.append((change['size'], [[''] * width] * (change['synced_rows'] - change['size'])))
+
+            if change['size'] > len(self.shards_of(title)) * self.shard_rows:
+                self.add_shards(title, -(-change['size'] // self.shard_rows))
+
+            for start, rows in spans:
+                for shard, row, values in self.split(title, start, rows):
+                    data.append({
+                        'range': absolute_range_name(shard, f'{rowcol_to_a1(row, 1)}:{rowcol_to_a1(row+len(values)-1, width)}'),
+                        'values': values
+                    })
+
+        if data:
+            self.g.values_batch_update({'valueInputOption': 'RAW', 'data': data})
+
+    def replace_all(self, values):
+        ''' Clears and rewrites data rows, values: {title: [value rows]} '''
+
+        from gspread.utils import absolute_range_name
+
+        self.g.values_batch_clear(body={'ranges': [absolute_range_name(s, 'A2:Z') for t in values for s in self.shards_of(t)]})
+        self.write_changes({t: {'spans': [(0, rows)] if rows else [], 'size': len(rows), 'synced_rows': 0} for t, rows in values.items()})
+
+class SQLiteBackend:
+    def __init__(self, path=db_path, sheet_titles=DEFAULT_SHEET_TITLES, mirror=None) -> None:
+        ''' Local SQLite storage, rows keyed by (sheet, position) with imdbID/eimdbID indexes
+
+        Batches are written in a single transaction. mirror (a GSheetsBackend)
+        receives a copy of every write for viewing. It is only read once, to seed
+        an empty database, and rewritten in full before the first change is sent
+        to it (or after a failed write).
+        '''
+
+        self.path = path
+        self.mirror = mirror
+        self.mirror_checked = False
+        self.mirror_stale = False
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        columns = ', '.join(f'"{t}"' for t in ROW_TITLES)
+
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self.db.execute('CREATE TABLE IF NOT EXISTS sheets (title TEXT PRIMARY KEY, idx INTEGER NOT NULL)')
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS entries (sheet TEXT NOT NULL, pos INTEGER NOT NULL, {columns}, PRIMARY KEY (sheet, pos))')
+            self.db.execute('CREATE INDEX IF NOT EXISTS entries_imdbID ON entries ("imdbID")')
+            self.db.execute('CREATE INDEX IF NOT EXISTS entries_eimdbID ON entries ("eimdbID")')
+            self.db.execute('CREATE TABLE IF NOT EXISTS blocks (sheet TEXT NOT NULL, block INTEGER NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (sheet, block))')
+
+            if not self.db.execute('SELECT COUNT(*) FROM sheets').fetchone()[0]:
+                self.db.executemany('INSERT INTO sheets (title, idx) VALUES (?, ?)', [(t, i) for i, t in enumerate(sheet_titles)])
+                self.touch()
+
+    @property
+    def id(self):
+        return self.path
+
+    @property
+    def title(self):
+        return os.path.basename(self.path)
+
+    @property
+    def url(self):
+        return self.mirror.url if self.mirror else f'file://{self.path}'
+
+    def touch(self) -> int:
+        ''' Bumps and returns the data revision '''
+
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        revision = int(row[0]) + 1 if row else 1
+
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('revision', ?)", (str(revision),))
+        return revision
+
+    def get_meta(self, key):
+        row = self.db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def check_mirror(self):
+        ''' On first use with a mirror the database is seeded from it when empty, and
+        the mirror is marked for a full rewrite unless it was last synced from here
+        '''
+
+        if not self.mirror or self.mirror_checked:
+            return
+
+        self.mirror_checked = True
+
+        if self.get_meta('mirror') == self.mirror.id:
+            return
+
+        self.mirror_stale = True
+
+        if not self.db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]:
+            self.seed(self.mirror)
+
+    def seed(self, source):
+        ''' Copies worksheets and non-empty rows of backend source into the database '''
+
+        titles = [t for t, _ in source.sheets()]
+        values = source.read_all(titles)
+        placeholders = ', '.join('?' * (len(ROW_TITLES) + 2))
+
+        with self.db:
+            self.db.execute('DELETE FROM sheets')
+            self.db.executemany('INSERT INTO sheets (title, idx) VALUES (?, ?)', [(t, i) for i, t in enumerate(titles)])
+            revision = self.touch()
+
+            for title in titles:
+                rows = values.get(title) or [[]]
+                columns = {v: i for i, v in enumerate(rows[0]) if v}
+                rows = [r for r in rows[1:] if any(r)]
+
+                self.db.executemany(
+                    f'INSERT OR REPLACE INTO entries VALUES ({placeholders})',
+                    [
+                        (title, pos, *(r[columns[t]] if t in columns and columns[t] < len(r) and r[columns[t]] else 'N/A' for t in ROW_TITLES))
+                        for pos, r in enumerate(rows)
+                    ]
+                )
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO blocks (sheet, block, version) VALUES (?, ?, ?)',
+                    [(title, b, revision) for b in range(-(-len(rows) // SYNC_BLOCK))]
+                )
+
+        print(f'Seeded local database from: {source.title}')
+
+    def sheets(self):
+        self.check_mirror()
+
+        return [(t, None) for t, in self.db.execute('SELECT title FROM sheets ORDER BY idx')]
+
+    def modified_time(self):
+        self.check_mirror()
+
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return row[0] if row else None
+
+    def probe(self, titles):
+        ''' Row counts and block versions, blocks never written since creation are left out '''
+
+        probes = {t: {'rows': 0, 'blocks': {}} for t in titles}
+
+        for title, rows in self.db.execute('SELECT sheet, COUNT(*) FROM entries GROUP BY sheet'):
+            if title in probes:
+                probes[title]['rows'] = rows
+
+        for title, block, version in self.db.execute('SELECT sheet, block, version FROM blocks'):
+            if title in probes:
+                probes[title]['blocks'][block] = version
+
+        return probes
+
+    def read_blocks(self, blocks):
+        columns = ', '.join(f'"{t}"' for t in ROW_TITLES)
+
+        return {
+            title: {
+                b: list(map(list, self.db.execute(
+                    f'SELECT {columns} FROM entries WHERE sheet = ? AND pos >= ? AND pos < ? ORDER BY pos',
+                    (title, b * SYNC_BLOCK, (b+1) * SYNC_BLOCK)
+                )))
+                for b in numbers
+            }
+            for title, numbers in blocks.items()
+        }
+
+    def read_all(self, titles):
+        columns = ', '.join(f'"{t}"' for t in ROW_TITLES)
+
+        return {
+            t: [list(ROW_TITLES), *map(list, self.db.execute(f'SELECT {columns} FROM entries WHERE sheet = ? ORDER BY pos', (t,)))]
+            for t in titles
+        }
+
+    def write_titles(self, titles):
+        # Columns are fixed by the schema
+        if self.mirror:
+            self.mirror.write_titles(titles)
+
+    def write_changes(self, changes):
+        placeholders = ', '.join('?' * (len(ROW_TITLES) + 2))
+
+        with self.db:
+            revision = self.touch()
+
+            for title, change in changes.items():
+                blocks = set()
+
+                for start, rows in change['spans']:
+                    self.db.executemany(
+                        f'INSERT OR REPLACE INTO entries VALUES ({placeholders})',
+                        [(title, start+i, *row) for i, row in enumerate(rows)]
+                    )
+                    blocks.update(range(start // SYNC_BLOCK, (start + len(rows) - 1) // SYNC_BLOCK + 1))
+
+                self.db.execute('DELETE FROM entries WHERE sheet = ? AND pos >= ?', (title, change['size']))
+
+                if change['synced_rows'] > change['size']:
+                    blocks.update(range(change['size'] // SYNC_BLOCK, (change['synced_rows'] - 1) // SYNC_BLOCK + 1))
+
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO blocks (sheet, block, version) VALUES (?, ?, ?)',
+                    [(title, b, revision) for b in blocks]
+                )
+
+        if self.mirror:
+            self.check_mirror()
+
+            if self.mirror_stale:
+                self.sync_mirror()
+                return
+
+            try:
+                self.mirror.write_changes(changes)
+            except Exception as e:
+                print(f'Failed to mirror changes\nError: {e}')
+                self.mark_mirror(synced=False)
+
+    def mark_mirror(self, synced):
+        ''' Records whether the mirror matches local data, across sessions '''
+
+        self.mirror_stale = not synced
+
+        with self.db:
+            if synced:
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('mirror', ?)", (self.mirror.id,))
+            else:
+                self.db.execute("DELETE FROM meta WHERE key = 'mirror'")
+
+    def sync_mirror(self):
+        ''' Rewrites the whole mirror from local data '''
+
+        if not self.mirror:
+            return
+
+        titles = [t for t, in self.db.execute('SELECT title FROM sheets ORDER BY idx')]
+
+        try:
+            self.mirror.replace_all({t: v[1:] for t, v in self.read_all(titles).items()})
+        except Exception as e:
+            print(f'Failed to mirror changes\nError: {e}')
+            self.mark_mirror(synced=False)
+            return
+
+        self.mark_mirror(synced=True)
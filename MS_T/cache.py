@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+cache_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'omdb_cache.sqlite3')
+
+DAY = 24 * 60 * 60
+FINISHED_TTL = 30 * DAY
+ONGOING_TTL = DAY
+MISSING_TTL = 7 * DAY
+MAX_ENTRIES = 20000
+
+class QueryCache:
+    def __init__(self, path=cache_path, finished_ttl=FINISHED_TTL, ongoing_ttl=ONGOING_TTL, missing_ttl=MISSING_TTL, max_entries=MAX_ENTRIES) -> None:
+        ''' On-disk cache of omdb responses keyed by query params (apikey excluded)
+
+        Finished titles live for finished_ttl, ongoing series (Year like "2021–"),
+        latest seasons and broad searches for ongoing_ttl, and "not found" responses
+        for missing_ttl. Least recently used entries are evicted past max_entries.
+        '''
+
+        self.path = path
+        self.finished_ttl = finished_ttl
+        self.ongoing_ttl = ongoing_ttl
+        self.missing_ttl = missing_ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self.db.commit()
+
+    @staticmethod
+    def key(params):
+        ''' Normalized params without apikey or empty values
+
+        >>> QueryCache.key({'i': 'TT9140554', 'Season': 1, 'Episode': None, 'apikey': '...'})
+        '[["i", "tt9140554"], ["season", "1"]]'
+        '''
+
+        return json.dumps(sorted(
+            (str(k).lower(), str(v).strip().lower()) for k, v in params.items() if k != 'apikey' and v is not None
+        ))
+
+    def ttl(self, params, value):
+        if value.get('Response') != 'True':
+            return self.missing_ttl
+
+        if params.get('s') or value.get('Year', '').endswith('–'):
+            return self.ongoing_ttl
+
+        # Latest season of a series can still gain episodes
+        if value.get('Season') and value.get('totalSeasons') not in (None, 'N/A'):
+            try:
+                if int(value['Season']) >= int(value['totalSeasons']):
+                    return self.ongoing_ttl
+            except ValueError:
+                return self.ongoing_ttl
+
+        return self.finished_ttl
+
+    def get(self, params):
+        ''' Returns cached response json or None if missing/expired '''
+
+        key = self.key(params)
+        now = time.time()
+
+        with self.lock:
+            row = self.db.execute('SELECT value, expires FROM responses WHERE key = ?', (key,)).fetchone()
+
+            if not row:
+                return
+
+            if row[1] < now:
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.db.commit()
+                return
+
+            self.db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self.db.commit()
+
+        return json.loads(row[0])
+
+    def set(self, params, value):
+        now = time.time()
+
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                (self.key(params), json.dumps(value), now + self.ttl(params, value), now)
+            )
+            self.evict()
+            self.db.commit()
+
+    def evict(self):
+        total = self.db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+        if total > self.max_entries:
+            self.db.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)',
+                (total - self.max_entries,)
+            )
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM responses')
+            self.db.commit()
+
+query_cache = None
+
+def get_query_cache():
+    ''' Returns shared QueryCache, created on first use '''
+
+    global query_cache
+
+    if query_cache is None:
+        query_cache = QueryCache()
+
+    return query_cache
+
+def configure_query_cache(**k):
+    ''' Replaces shared QueryCache, see QueryCache for options '''
+
+    global query_cache
+
+    query_cache = QueryCache(**k)
+    return query_cache
@@ -0,0 +1,93 @@
+import sys
+from collections.abc import Mapping
+
+ROW_TITLES = (
+    'Title',
+    'Date',
+    'imdbID',
+    'Link',
+    'Type',
+    'Season',
+    'Episode',
+    'eimdbID',
+    'Genre',
+)
+titles = frozenset(ROW_TITLES)
+# Values repeated across rows (every episode of a series shares these)
+interned_titles = {'Date', 'imdbID', 'Type', 'Season', 'Episode', 'Genre'}
+MISSING = 'N/A'
+
+class Entry(Mapping):
+    ''' Worksheet row with one slot per row title
+
+    Missing values are stored as None and read back as 'N/A', repeated values are
+    interned. Reads like the dict entries it replaces:
+
+    >>> entry = Entry({'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+    >>> entry['Genre'], entry.get('imdbID')
+    ('N/A', 'tt1517268')
+    '''
+
+    __slots__ = ROW_TITLES
+
+    def __init__(self, param=None) -> None:
+        param = param or {}
+
+        for t in ROW_TITLES:
+            self[t] = param.get(t)
+
+    @classmethod
+    def from_row(cls, row):
+        ''' Entry from values in ROW_TITLES order '''
+
+        entry = cls.__new__(cls)
+
+        for t, v in zip(ROW_TITLES, row):
+            entry[t] = v
+
+        for t in ROW_TITLES[len(row):]:
+            entry[t] = None
+
+        return entry
+
+    def __getitem__(self, key):
+        if key not in titles:
+            raise KeyError(key)
+
+        v = getattr(self, key)
+        return MISSING if v is None else v
+
+    def __setitem__(self, key, value):
+        if key not in titles:
+            raise KeyError(key)
+
+        if not value or value == MISSING:
+            value = None
+        else:
+            # Numbers (season/episode from omdb or prompts) are kept as the text the sheet holds
+            if isinstance(value, int):
+                value = str(value)
+
+            if key in interned_titles and isinstance(value, str):
+                value = sys.intern(value)
+
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(ROW_TITLES)
+
+    def __len__(self):
+        return len(ROW_TITLES)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def row(self):
+        ''' Values in ROW_TITLES order '''
+
+        return [self[t] for t in ROW_TITLES]
+
+    def copy(self) -> dict:
+        ''' Plain dict copy, free to take extra keys '''
+
+        return dict(self)
@@ -0,0 +1,93 @@
+import os
+import csv
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from .entry import ROW_TITLES
+from .stats import carry_context
+
+EXPORT_TITLE = 'Movie/Show Tracker Exports'
+export_formats = {
+    'csv': 'Comma separated values, one entry per row',
+    'jsonl': 'JSON Lines, one entry object per line'
+}
+
+def open_output(file_path, compress=False):
+    if compress:
+        return gzip.open(file_path, 'wt', newline='', encoding='utf-8')
+
+    return open(file_path, 'w', newline='', encoding='utf-8')
+
+def matches(entry, filters):
+    ''' filters: {row title: value or predicate(value)}, all must match '''
+
+    for title, f in filters.items():
+        if not (f(entry[title]) if callable(f) else entry[title] == f):
+            return False
+
+    return True
+
+def export_worksheet(wk, file_path, format='csv', columns=None, filters=None, compress=False):
+    ''' Streams worksheet cache entries to file_path one row at a time
+
+    :param columns: row titles to write (default all)
+    :param filters: see matches
+
+    :returns: entries written
+    :rtype: int
+    '''
+
+    if format not in export_formats:
+        raise ValueError(f'Invalid format: {format}\nOptions: {list(export_formats)}')
+
+    columns = list(columns or ROW_TITLES)
+    written = 0
+
+    with open_output(file_path, compress) as file:
+        if format == 'csv':
+            csv_writer = csv.writer(file)
+            csv_writer.writerow(columns)
+
+        for entry in wk.cache:
+            if filters and not matches(entry, filters):
+                continue
+
+            if format == 'csv':
+                csv_writer.writerow([entry[c] for c in columns])
+            else:
+                file.write(json.dumps({c: entry[c] for c in columns}) + '\n')
+
+            written += 1
+
+    return written
+
+def export_all(spreadsheet, dir_path=EXPORT_TITLE, format='csv', columns=None, filters=None, compress=False, titles=None):
+    ''' Exports worksheets (default all non-empty) in parallel, one file each
+
+    :returns: {worksheet title: (file path, entries written)}
+    :rtype: dict
+    '''
+
+    unknown = [c for c in [*(columns or []), *(filters or {})] if c not in ROW_TITLES]
+
+    if unknown:
+        raise ValueError(f'Invalid columns: {unknown}\nOptions: {list(ROW_TITLES)}')
+
+    os.makedirs(dir_path, exist_ok=True)
+    spreadsheet.ensure_loaded()
+
+    sheets = [i for i in spreadsheet.worksheets if (titles is None or i.title in titles) and i.cache]
+    extension = f"{format}{'.gz' if compress else ''}"
+    paths = [os.path.join(dir_path, f'{i.title}.{extension}') for i in sheets]
+
+    if not sheets:
+        return {}
+
+    def export(args):
+        wk, path = args
+        return export_worksheet(wk, path, format=format, columns=columns, filters=filters, compress=compress)
+
+    with ThreadPoolExecutor(max_workers=len(sheets)) as executor:
+        counts = list(executor.map(carry_context(export), zip(sheets, paths)))
+
+    return {wk.title: (path, n) for wk, path, n in zip(sheets, paths, counts)}
@@ -0,0 +1,139 @@
+import os
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from .utils import query, imdbID_pattern, get_ID, MAX_PARALLEL_REQUESTS
+from .omdb import get_client, QuotaExceeded
+from .stats import carry_context
+
+BATCH_SIZE = 50
+import_policies = {
+    'accept': 'Add exact title matches',
+    'review': 'Queue exact title matches to a review file',
+    'skip': 'Only import imdbIDs, skip titles'
+}
+
+def read_titles(file_path):
+    ''' Yields non-empty csv cells one at a time '''
+
+    with open(file_path, newline='') as file:
+        for row in csv.reader(file):
+            for entry in row:
+                entry = entry.strip()
+
+                if entry:
+                    yield entry
+
+def resolve(entry, API_KEY=None):
+    ''' Exact omdb match for a title or imdbID, without prompting '''
+
+    if imdbID_pattern.match(entry):
+        return query({'i': entry.lower(), 'apikey': API_KEY})
+
+    return query({'t': entry, 'apikey': API_KEY})
+
+def write_rows(file_path, header, rows):
+    with open(file_path, 'w', newline='') as file:
+        csv_writer = csv.writer(file)
+        csv_writer.writerow(header)
+        csv_writer.writerows(rows)
+
+def import_file(spreadsheet, wk, file_path, policy='accept', series=True, max_parallel=None, batch_size=BATCH_SIZE):
+    ''' Imports titles/imdbIDs from a csv file into worksheet wk without prompting
+
+    Entries are read in batches. Duplicates within the file, IDs already in the
+    spreadsheet registry and titles confidently matching a tracked title (see
+    Spreadsheet.title_index) are dropped before any request, the rest are resolved
+    concurrently and added. Batches the daily quota cannot cover are deferred to
+    the failure file. Results are saved once at the end.
+
+    :param policy: what to do with exact title matches, see import_policies
+    :param series: Worksheet.add series mode (True for all seasons)
+
+    :returns: {'imported': [entries], 'failed': [(entry, reason)], 'review': [(entry, imdbID, title, year)]}
+    :rtype: dict
+    '''
+
+    if policy not in import_policies:
+        raise ValueError(f'Invalid policy: {policy}\nOptions: {list(import_policies)}')
+
+    results = {'imported': [], 'failed': [], 'review': []}
+    spreadsheet.ensure_loaded()
+    seen = set()
+    processed = 0
+
+    def import_batch(batch, executor):
+        to_resolve = []
+
+        for entry in batch:
+            key = entry.lower()
+
+            if key in seen:
+                results['failed'].append((entry, 'duplicate in file'))
+            elif key in spreadsheet.registry:
+                results['failed'].append((entry, 'already tracked'))
+            elif not imdbID_pattern.match(entry) and spreadsheet.title_index.best(entry):
+                # Confident match on a tracked title, no lookup needed
+                results['failed'].append((entry, 'already tracked'))
+            elif policy == 'skip' and not imdbID_pattern.match(entry):
+                results['failed'].append((entry, 'skipped title'))
+            else:
+                to_resolve.append(entry)
+
+            seen.add(key)
+
+        # Defer the batch when the daily quota cannot cover it
+        try:
+            get_client().ensure_quota(len(to_resolve), spreadsheet.API_KEY)
+        except QuotaExceeded:
+            results['failed'].extend((entry, 'deferred (daily quota)') for entry in to_resolve)
+            return
+
+        for entry, ms in zip(to_resolve, executor.map(carry_context(lambda e: resolve(e, spreadsheet.API_KEY)), to_resolve)):
+            if not ms:
+                results['failed'].append((entry, 'not found'))
+            elif get_ID(ms) in spreadsheet.registry:
+                results['failed'].append((entry, 'already tracked'))
+            elif policy == 'review' and not imdbID_pattern.match(entry):
+                results['review'].append((entry, ms['imdbID'], ms['Title'], ms.get('Year')))
+            else:
+                r = wk.add(param=ms, se=series)
+
+                if r:
+                    results['imported'].append(r)
+                else:
+                    results['failed'].append((entry, 'not added'))
+
+    with ThreadPoolExecutor(max_workers=max_parallel or MAX_PARALLEL_REQUESTS) as executor:
+        batch = []
+
+        for entry in read_titles(file_path):
+            batch.append(entry)
+
+            if len(batch) >= batch_size:
+                import_batch(batch, executor)
+                processed += len(batch)
+                batch = []
+
+                print(f"\nProcessed {processed} - Imported {len(results['imported'])}, Failed {len(results['failed'])}, Review {len(results['review'])}")
+
+        if batch:
+            import_batch(batch, executor)
+            processed += len(batch)
+
+    if results['imported']:
+        spreadsheet.save()
+
+    base_path = os.path.splitext(file_path)[0]
+
+    if results['failed']:
+        write_rows(f'{base_path}_failed.csv', ['Entry', 'Reason'], results['failed'])
+        print(f"Failed entries written to: {base_path}_failed.csv")
+
+    if results['review']:
+        write_rows(f'{base_path}_review.csv', ['Entry', 'imdbID', 'Title', 'Year'], results['review'])
+        print(f"Matches to review written to: {base_path}_review.csv")
+
+    print(f"\nImported {len(results['imported'])} out of {processed} " +
+          f"{'- Failed: ' + str(len(results['failed'])) if results['failed'] else ''}")
+
+    return results
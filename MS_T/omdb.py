@@ -0,0 +1,149 @@
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timezone
+from .cache import cache_path
+from .session import get_session
+
+OMDB_URL = "https://www.omdbapi.com/"
+RATE = 10
+CAPACITY = 10
+DAILY_LIMIT = 1000
+
+class QuotaExceeded(Exception):
+    pass
+
+class TokenBucket:
+    def __init__(self, rate=RATE, capacity=CAPACITY) -> None:
+        ''' Allows rate requests per second with bursts of up to capacity
+
+        Thread-safe so callers on different event loops/threads share one budget
+        '''
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        ''' Takes a token, returns seconds to wait before using it '''
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+
+        if wait:
+            await asyncio.sleep(wait)
+
+class QuotaCounter:
+    def __init__(self, path=cache_path, daily_limit=DAILY_LIMIT) -> None:
+        ''' Persistent count of omdb requests per apikey per (UTC) day
+
+        Keys are stored hashed
+        '''
+
+        self.daily_limit = daily_limit
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('CREATE TABLE IF NOT EXISTS quota (key TEXT NOT NULL, day TEXT NOT NULL, used INTEGER NOT NULL, PRIMARY KEY (key, day))')
+        self.db.commit()
+
+    @staticmethod
+    def key(apikey):
+        return hashlib.sha256(str(apikey).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def today():
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def used(self, apikey):
+        with self.lock:
+            row = self.db.execute('SELECT used FROM quota WHERE key = ? AND day = ?', (self.key(apikey), self.today())).fetchone()
+
+        return row[0] if row else 0
+
+    def remaining(self, apikey):
+        return max(self.daily_limit - self.used(apikey), 0)
+
+    def reserve(self, apikey, n=1):
+        ''' Counts n requests against today's quota, raises QuotaExceeded if it would run out '''
+
+        key, day = self.key(apikey), self.today()
+
+        with self.lock:
+            row = self.db.execute('SELECT used FROM quota WHERE key = ? AND day = ?', (key, day)).fetchone()
+            used = row[0] if row else 0
+
+            if used + n > self.daily_limit:
+                raise QuotaExceeded(f'Daily omdb quota reached ({used}/{self.daily_limit} requests used today)')
+
+            self.db.execute('INSERT OR REPLACE INTO quota (key, day, used) VALUES (?, ?, ?)', (key, day, used + n))
+            self.db.commit()
+
+class AsyncOMDbClient:
+    def __init__(self, rate=RATE, capacity=CAPACITY, daily_limit=DAILY_LIMIT, quota=None, url=OMDB_URL) -> None:
+        ''' Rate limited, quota aware omdb client
+
+        Requests go through the shared OMDbSession on worker threads, every
+        attempt it sends (retries included) takes a rate token and counts
+        against the daily quota. get_sync runs a request to completion for
+        synchronous callers
+        '''
+
+        self.url = url
+        self.bucket = TokenBucket(rate=rate, capacity=capacity)
+        self.quota = quota or QuotaCounter(daily_limit=daily_limit)
+
+    def ensure_quota(self, n, apikey):
+        ''' Raises QuotaExceeded if fewer than n requests are left today '''
+
+        remaining = self.quota.remaining(apikey)
+
+        if remaining < n:
+            raise QuotaExceeded(f'Not enough daily omdb quota: {n} requests needed, {remaining} left')
+
+    def attempt(self, apikey):
+        ''' Accounts for one HTTP request, raises QuotaExceeded once the quota is used up '''
+
+        self.quota.reserve(apikey)
+        wait = self.bucket.reserve()
+
+        if wait:
+            time.sleep(wait)
+
+    async def get(self, params):
+        return await asyncio.to_thread(get_session().get, self.url, params, before_attempt=lambda: self.attempt(params.get('apikey')))
+
+    def get_sync(self, params):
+        return asyncio.run(self.get(params))
+
+client = None
+
+def get_client():
+    ''' Returns shared AsyncOMDbClient, created on first use '''
+
+    global client
+
+    if client is None:
+        client = AsyncOMDbClient()
+
+    return client
+
+def configure_client(**k):
+    ''' Replaces shared AsyncOMDbClient, see AsyncOMDbClient for options '''
+
+    global client
+
+    client = AsyncOMDbClient(**k)
+    return client
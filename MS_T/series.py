@@ -0,0 +1,222 @@
+import re
+import json
+import time
+import sqlite3
+import threading
+from datetime import date
+from .cache import cache_path, ONGOING_TTL
+from .utils import query, query_seasons
+
+finished_year_pattern = re.compile(r'^\d{4}–\d{4}$')
+
+def is_finished(year) -> bool:
+    ''' "2008–2013" is finished, "2021–" is not, a single year only once it is over '''
+
+    year = str(year or '').strip()
+
+    if finished_year_pattern.match(year):
+        return True
+
+    return year.isdigit() and int(year) < date.today().year
+
+class SeriesStore:
+    def __init__(self, path=cache_path, ongoing_ttl=ONGOING_TTL) -> None:
+        ''' On-disk store of series totalSeasons, season episode lists and episode -> series IDs
+
+        Finished series are never fetched again once all their seasons are
+        stored, ongoing series refresh their latest season after ongoing_ttl
+        (picking up new seasons from its totalSeasons)
+        '''
+
+        self.path = path
+        self.ongoing_ttl = ongoing_ttl
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('CREATE TABLE IF NOT EXISTS series (imdbID TEXT PRIMARY KEY, title TEXT NOT NULL, year TEXT NOT NULL, total_seasons INTEGER NOT NULL)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS seasons (imdbID TEXT NOT NULL, season INTEGER NOT NULL, episodes TEXT NOT NULL, updated REAL NOT NULL, PRIMARY KEY (imdbID, season))')
+        self.db.execute('CREATE TABLE IF NOT EXISTS episodes (eimdbID TEXT PRIMARY KEY, imdbID TEXT NOT NULL, season INTEGER NOT NULL, episode TEXT NOT NULL)')
+        self.db.commit()
+
+    def get_series(self, imdbID) -> dict:
+        ''' Returns {'Title', 'imdbID', 'Year', 'totalSeasons', 'finished'} or None if not stored '''
+
+        with self.lock:
+            row = self.db.execute('SELECT title, year, total_seasons FROM series WHERE imdbID = ?', (imdbID,)).fetchone()
+
+        if row:
+            return {'Title': row[0], 'imdbID': imdbID, 'Year': row[1], 'totalSeasons': row[2], 'finished': is_finished(row[1])}
+
+    def set_series(self, ms):
+        ''' Stores series info from an omdb series response, ignored without totalSeasons '''
+
+        try:
+            total = int(ms['totalSeasons'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO series (imdbID, title, year, total_seasons) VALUES (?, ?, ?, ?)',
+                (ms['imdbID'], ms['Title'], ms.get('Year', ''), total)
+            )
+            self.db.commit()
+
+        return self.get_series(ms['imdbID'])
+
+    def get_season(self, imdbID, season) -> tuple:
+        ''' Returns (episodes, updated) or None if not stored '''
+
+        with self.lock:
+            row = self.db.execute('SELECT episodes, updated FROM seasons WHERE imdbID = ? AND season = ?', (imdbID, int(season))).fetchone()
+
+        if row:
+            return json.loads(row[0]), row[1]
+
+    def set_season(self, imdbID, season, episodes):
+        season = int(season)
+
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO seasons (imdbID, season, episodes, updated) VALUES (?, ?, ?, ?)',
+                (imdbID, season, json.dumps(episodes), time.time())
+            )
+            self.db.executemany(
+                'INSERT OR REPLACE INTO episodes (eimdbID, imdbID, season, episode) VALUES (?, ?, ?, ?)',
+                [(i['imdbID'], imdbID, season, str(i['Episode'])) for i in episodes if i.get('imdbID')]
+            )
+            self.db.commit()
+
+    def series_of(self, eimdbID) -> dict:
+        ''' Returns {'imdbID', 'Season', 'Episode'} of a stored episode or None '''
+
+        with self.lock:
+            row = self.db.execute('SELECT imdbID, season, episode FROM episodes WHERE eimdbID = ?', (eimdbID,)).fetchone()
+
+        if row:
+            return {'imdbID': row[0], 'Season': str(row[1]), 'Episode': row[2]}
+
+    def clear(self):
+        with self.lock:
+            for table in ('series', 'seasons', 'episodes'):
+                self.db.execute(f'DELETE FROM {table}')
+
+            self.db.commit()
+
+    def series(self, imdbID, ms=None, API_KEY=None) -> dict:
+        ''' Stored series info, from ms (an omdb series response) or one query if missing '''
+
+        stored = self.get_series(imdbID)
+
+        if stored:
+            return stored
+
+        if not ms or not ms.get('totalSeasons'):
+            ms = query({
+                'i': imdbID,
+                'apikey': API_KEY
+            })
+
+        if ms:
+            return self.set_series(ms)
+
+    def stale(self, info, season) -> bool:
+        ''' Stored season needs fetching: missing, or latest season of an ongoing series past ongoing_ttl '''
+
+        stored = self.get_season(info['imdbID'], season)
+
+        if not stored:
+            return True
+
+        return not info['finished'] and int(season) >= info['totalSeasons'] and time.time() - stored[1] > self.ongoing_ttl
+
+    def refresh_latest(self, info, API_KEY=None) -> dict:
+        ''' Refetches the latest season of an ongoing series if stale, returns updated series info '''
+
+        if info['finished'] or not self.get_season(info['imdbID'], info['totalSeasons']) or not self.stale(info, info['totalSeasons']):
+            return info
+
+        data = query({
+            'i': info['imdbID'],
+            'Season': info['totalSeasons'],
+            'apikey': API_KEY
+        }, refresh=True)
+
+        if not data or not data.get('Episodes'):
+            return info
+
+        self.set_season(info['imdbID'], info['totalSeasons'], data['Episodes'])
+
+        # A new season shows up as a larger totalSeasons
+        if data.get('totalSeasons', 'N/A') != 'N/A' and int(data['totalSeasons']) > info['totalSeasons']:
+            return self.set_series(dict(info, totalSeasons=data['totalSeasons'])) or info
+
+        return info
+
+    def seasons(self, imdbID, seasons=None, ms=None, API_KEY=None) -> list:
+        ''' Episode lists of seasons (default all), only fetching what isn't stored
+
+        :param ms: omdb series response if already known (saves the series query)
+
+        :returns: [(season #, [episode, ...]), ...] in season order, None if the series is unknown
+        :rtype: list
+        '''
+
+        info = self.series(imdbID, ms=ms, API_KEY=API_KEY)
+
+        if not info:
+            return
+
+        info = self.refresh_latest(info, API_KEY=API_KEY)
+        wanted = [int(i) for i in seasons] if seasons else list(range(1, info['totalSeasons']+1))
+        missing = [n for n in wanted if self.stale(info, n)]
+
+        if missing:
+            for n, season in query_seasons(imdbID, info['totalSeasons'], title=info['Title'], API_KEY=API_KEY, seasons=missing):
+                if season.get('Episodes'):
+                    self.set_season(imdbID, n, season['Episodes'])
+
+        results = []
+
+        for n in wanted:
+            stored = self.get_season(imdbID, n)
+
+            if stored:
+                results.append((n, stored[0]))
+
+        return results
+
+    def episodes(self, imdbID, season=None, episode=None, ms=None, API_KEY=None) -> list:
+        ''' Episodes of a series (all, one season, or one episode) as [(season #, episode), ...] '''
+
+        results = self.seasons(imdbID, seasons=[season] if season else None, ms=ms, API_KEY=API_KEY)
+
+        if results is None:
+            return
+
+        episodes = [(n, i) for n, season_episodes in results for i in season_episodes]
+
+        if episode:
+            episodes = [(n, i) for n, i in episodes if str(i['Episode']) == str(episode)]
+
+        return episodes
+
+series_store = None
+
+def get_series_store():
+    ''' Returns shared SeriesStore, created on first use '''
+
+    global series_store
+
+    if series_store is None:
+        series_store = SeriesStore()
+
+    return series_store
+
+def configure_series_store(**k):
+    ''' Replaces shared SeriesStore, see SeriesStore for options '''
+
+    global series_store
+
+    series_store = SeriesStore(**k)
+    return series_store
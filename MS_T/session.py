@@ -0,0 +1,103 @@
+import time
+import random
+import threading
+
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 15
+MAX_RETRIES = 3
+BACKOFF = 0.5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class OMDbSession:
+    def __init__(self, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF) -> None:
+        ''' Shared keep-alive session for omdb GET requests
+
+        Failed connections, timeouts and 429/5xx responses are retried up to
+        retries times with jittered exponential backoff (backoff * 2^attempt).
+        '''
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'retries': 0, 'errors': 0}
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.s = requests.Session()
+        self.s.mount('https://', self.adapter)
+        self.s.mount('http://', self.adapter)
+
+    @property
+    def stats(self):
+        ''' Request counts with new vs reused connections across pooled hosts '''
+
+        pools = self.adapter.poolmanager.pools
+        new = sum(pools[key].num_connections for key in pools.keys())
+        sent = sum(pools[key].num_requests for key in pools.keys())
+
+        with self.lock:
+            return {**self.counts, 'new_connections': new, 'reused_connections': max(sent - new, 0)}
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def get(self, url, params=None, before_attempt=None) -> 'requests.Response':
+        ''' GET with timeouts and retries, raises requests.RequestException when retries run out
+
+        :param before_attempt: called before every attempt (retries included), may raise to give up
+        '''
+
+        import requests
+
+        attempt = 0
+
+        while True:
+            if before_attempt:
+                before_attempt()
+
+            self.count('requests')
+
+            try:
+                response = self.s.get(url, params=params, timeout=self.timeout)
+
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    self.count('errors')
+                    raise
+
+            self.count('retries')
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def close(self):
+        self.s.close()
+
+session = None
+
+def get_session():
+    ''' Returns shared OMDbSession, created on first use '''
+
+    global session
+
+    if session is None:
+        session = OMDbSession()
+
+    return session
+
+def configure_session(**k):
+    ''' Replaces shared OMDbSession, see OMDbSession for options '''
+
+    global session
+
+    if session is not None:
+        session.close()
+
+    session = OMDbSession(**k)
+    return session
@@ -0,0 +1,80 @@
+import os
+import pickle
+from .entry import Entry
+
+snapshot_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'snapshot.pickle')
+SNAPSHOT_VERSION = 2
+
+def save_snapshot(spreadsheet, path=snapshot_path, modified=None):
+    ''' Writes worksheet caches to a local snapshot file
+
+    Entries are stored as value rows in row_titles order with each sheet's sync
+    state (rows still to be written), the file is replaced atomically
+    '''
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'id': spreadsheet.id,
+        'modified': modified,
+        'row_titles': spreadsheet.row_titles,
+        'sheets': {
+            i.title: {
+                'rows': [v.row() for v in i.cache],
+                'synced_rows': i._synced_rows,
+                'shifted_from': i._shifted_from,
+                'dirty': sorted(i._dirty)
+            } for i in spreadsheet.worksheets
+        }
+    }
+
+    tmp_path = path + '.tmp'
+
+    with open(tmp_path, 'wb') as file:
+        pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp_path, path)
+
+def read_snapshot(spreadsheet, path=snapshot_path):
+    ''' Returns snapshot dict if it belongs to spreadsheet, else None '''
+
+    if not os.path.exists(path):
+        return
+
+    try:
+        with open(path, 'rb') as file:
+            snapshot = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return
+
+    if snapshot.get('id') != spreadsheet.id or snapshot.get('row_titles') != spreadsheet.row_titles:
+        return
+
+    return snapshot
+
+def load_snapshot(spreadsheet, path=snapshot_path, modified=None):
+    ''' Fills worksheet caches from snapshot if the remote spreadsheet is unchanged
+
+    :param modified: remote modified time, snapshot is only used if it matches
+
+    :returns: True if loaded
+    '''
+
+    snapshot = read_snapshot(spreadsheet, path)
+
+    if not snapshot or not modified or snapshot['modified'] != modified:
+        return
+
+    sheets = snapshot['sheets']
+
+    if any(i.title not in sheets for i in spreadsheet.worksheets):
+        return
+
+    for i in spreadsheet.worksheets:
+        i.cache = [Entry.from_row(row) for row in sheets[i.title]['rows']]
+        i.mark_synced(rows=sheets[i.title]['synced_rows'], shifted_from=sheets[i.title]['shifted_from'])
+        i._dirty = set(sheets[i.title]['dirty'])
+
+    return True
@@ -1,99 +1,139 @@
-from .auth import (
-    authorize,
-    get_worksheetID,
-    unique_sheetname,
-    save_worksheetID
-)
-from .worksheet import Worksheet
-from .utils import sqGet, query, get_season_episode
-import csv, os
-
-EXPORT_TITLE = 'Movie/Show Tracker Exports'
-MAX_ENTRIES_PER_ROW = 15
-MAX_SHEET_ROWS = 50000
-cell_titlerow_format = {
-    'backgroundColor': {
-        'red': 249/255,
-        'green': 203/255,
-        'blue': 156/255
-    },
-    'horizontalAlignment': 'CENTER',
-    'textFormat': {
-        'bold': True
-    }
-}
+from .worksheet import Worksheet, select_row_title
+from .entry import Entry, ROW_TITLES
+from .backends import GSheetsBackend, SYNC_BLOCK
+from .importer import import_file, import_policies
+from .exporter import export_all, export_formats, EXPORT_TITLE
+from .snapshot import snapshot_path, save_snapshot, load_snapshot
+from .stats import operation
+from .title_index import TitleIndex
+from .autosave import AutoSaver
+from .utils import sqGet, imdbID_pattern, get_season_episode, get_ID
+from .series import get_series_store
+import os
+import threading
+
+# Returned by Spreadsheet.sync when changed sheets have unsaved local edits
+SYNC_PENDING = 'pending'
+# gspread Spreadsheet attributes reachable through Spreadsheet, anything else missing raises AttributeError
+GSPREAD_ATTRIBUTES = frozenset({
+    'sheet1', 'creationTime', 'lastUpdateTime', 'get_lastUpdateTime', 'locale', 'timezone',
+    'fetch_sheet_metadata', 'batch_update', 'values_get', 'values_batch_get', 'values_update',
+    'values_batch_update', 'values_append', 'values_clear', 'export',
+    'share', 'list_permissions', 'remove_permissions', 'transfer_ownership', 'accept_ownership'
+})
 
 class Spreadsheet:
-    def __init__(self, client=None, spreadsheet=None, API_KEY=None) -> None:
+    def __init__(self, client=None, spreadsheet=None, API_KEY=None, snapshot_path=snapshot_path, backend=None) -> None:
         ''' Contains gspread spreadsheet class for msdb methods
 
+        Data is stored through backend (default GSheetsBackend(client, spreadsheet)),
+        see MS_T.backends. Nothing is fetched until needed: worksheets are listed on
+        first use and caches are filled the first time any of them is read, from the
+        local snapshot when the stored data is unchanged since it was written
+        (snapshot_path=None disables snapshots)
+
         More info: https://docs.gspread.org/en/latest/api/models/spreadsheet.html
         '''
 
-        self.client = client or authorize()
-        self.sheetID = get_worksheetID()
-        self.g = spreadsheet or None
+        self.backend = backend or GSheetsBackend(client=client, spreadsheet=spreadsheet)
         self.API_KEY = API_KEY
-        
-        if not self.g:
-            if self.sheetID:
-                self.g = self.client.open_by_key(self.sheetID)
-            else:
-                self.g = self.new_spreadsheet()
+        self.snapshot_path = snapshot_path
+        self.registry = {}
+        self.loaded = False
+        self.synced = None
+        self.probes = None
+        self._worksheets = None
+        self._title_index = None
+        # Held while caches are mutated or saved, see enable_autosave
+        self.lock = threading.RLock()
+        self.autosaver = None
+
+    def __getattr__(self, __name: str):
+        # Only reached when normal lookup fails, falls back to the gspread object for
+        # known gspread attributes (anything else would open/authorize it for nothing)
+        if __name in GSPREAD_ATTRIBUTES and self.g is not None:
+            return getattr(self.g, __name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{__name}'")
+
+    @property
+    def client(self):
+        return getattr(self.backend, 'client', None)
+
+    @property
+    def g(self):
+        return getattr(self.backend, 'g', None)
+
+    @property
+    def worksheets(self):
+        if self._worksheets is None:
+            self._worksheets = [Worksheet(self, g, API_KEY=self.API_KEY, title=title) for title, g in self.backend.sheets()]
+
+        return self._worksheets
 
-                save_worksheetID(self.g.id)         
+    def ensure_loaded(self):
+        ''' Fills all worksheet caches on first use, from the snapshot when possible '''
 
-        self.worksheets = [Worksheet(self, self.g.worksheet(title=i.title), API_KEY=self.API_KEY) for i in self.g.worksheets()]
-        self.load()
+        if self.loaded:
+            return
+
+        # Set first so reads while filling don't recurse, cleared again if filling fails
+        self.loaded = True
 
-    def __getattribute__(self, __name: str):
         try:
-            return super().__getattribute__(__name)
-        except AttributeError:
-            if hasattr(self.g, __name):
-                return getattr(self.g, __name)
+            modified = self.modified_time() if self.snapshot_path else None
+
+            if self.snapshot_path and load_snapshot(self, self.snapshot_path, modified=modified):
+                self.mark_synced(modified)
+                print('Data loaded from snapshot!')
+            else:
+                self.load()
+        except Exception:
+            self.loaded = False
+            raise
+
+    @property
+    def id(self):
+        return self.backend.id
+
+    @property
+    def title(self):
+        return self.backend.title
+
+    @property
+    def url(self):
+        return self.backend.url
 
     @property
     def row_titles(self):
-        return [
-            'Title',
-            'Date',
-            'imdbID',
-            'Link',
-            'Type',
-            'Season',
-            'Episode',
-            'eimdbID',
-            'Genre',
-        ]
+        return list(ROW_TITLES)
 
     @property
     def all_values(self):
         return {i.title: i.cache for i in self.worksheets}
         
-    def new_spreadsheet(self):
-        title = f'Movie/Show Tracker - {unique_sheetname()}'
+    def modified_time(self):
+        ''' Returns stored data modified stamp from the backend '''
 
-        created_spreadsheet = self.client.create(title=title)
+        return self.backend.modified_time()
 
-        def format_wk(worksheet):
-            worksheet.format('A1:Z1', cell_titlerow_format)
-            worksheet.freeze(rows=1)
+    def probe(self):
+        ''' Returns backend change probes, None if the backend has none '''
 
-        def new_wk(title):
-            worksheet = created_spreadsheet.add_worksheet(title=title, cols=15, rows=MAX_SHEET_ROWS)
-            format_wk(worksheet)
+        if hasattr(self.backend, 'probe'):
+            return self.backend.probe([i.title for i in self.worksheets])
 
-        s1 = created_spreadsheet.sheet1
-        s1.add_rows(MAX_SHEET_ROWS-s1.row_count)
-        s1.update_title('Planned')
-        format_wk(s1)
+    def mark_synced(self, modified):
+        ''' Records that caches match stored data as of modified '''
 
-        new_wk('Available')
-        new_wk('Watched')
-        new_wk('Canceled')
+        self.synced = modified
+        self.probes = self.probe()
 
-        return created_spreadsheet
+    def write_snapshot(self, modified=None):
+        ''' Saves caches to the local snapshot, stamped with the remote modified time '''
+
+        if self.snapshot_path:
+            save_snapshot(self, self.snapshot_path, modified=modified or self.modified_time())
 
     def worksheet(self, title):
         for i in self.worksheets:
@@ -119,6 +159,75 @@ class Spreadsheet:
 
         return self.worksheet(selected.capitalize())
 
+    def register(self, ID, worksheet):
+        ''' Records that worksheet holds an entry with imdbID or eimdbID matching ID '''
+
+        self.registry.setdefault(ID, {})[worksheet.title] = worksheet
+
+    def unregister(self, ID, worksheet):
+        sheets = self.registry.get(ID)
+
+        if sheets is not None:
+            sheets.pop(worksheet.title, None)
+
+            if not sheets:
+                del self.registry[ID]
+
+    @property
+    def title_index(self):
+        ''' TitleIndex over all worksheet caches, built on first use '''
+
+        if self._title_index is None:
+            self.ensure_loaded()
+            self._title_index = TitleIndex()
+
+            for wk in self.worksheets:
+                for entry in wk.cache:
+                    self._title_index.add(entry)
+
+        return self._title_index
+
+    def register_title(self, entry):
+        if self._title_index is not None:
+            self._title_index.add(entry)
+
+    def unregister_title(self, entry):
+        if self._title_index is not None:
+            self._title_index.remove(entry)
+
+    def reset_titles(self):
+        self._title_index = None
+
+    def search_title(self, title=None):
+        ''' Returns a tracked movie/series on a confident fuzzy title (or imdbID) match,
+        otherwise searches omdb with sqGet
+        '''
+
+        title = title or input('Enter movie/show: ')
+
+        if imdbID_pattern.match(title):
+            doc = self.title_index.docs.get(title.lower())
+            ms = doc and {'Title': doc['Title'], 'imdbID': doc['imdbID'], 'Type': doc['Type'], 'Response': 'True', 'local': True}
+        else:
+            ms = self.title_index.best(title)
+
+        if ms:
+            print(f"Found tracked: {ms['Title']} - https://www.imdb.com/title/{ms['imdbID']}")
+            return ms
+
+        return sqGet(title=title, API_KEY=self.API_KEY)
+
+    def locate(self, ID, ignore=[]):
+        ''' Returns [(worksheet, cache position)] of entries matching ID, skipping ignored worksheets '''
+
+        if isinstance(ignore, str):
+            ignore = [ignore]
+
+        self.ensure_loaded()
+
+        return [(wk, wk.index_of(ID)) for title, wk in self.registry.get(ID, {}).items() if title not in ignore]
+
+    @operation
     def get_dupes(self, **k):
         ''' 
         Checks all worksheets for duplicate entry input and returns results
@@ -146,7 +255,7 @@ class Spreadsheet:
         :rtype: dict
         '''
 
-        param = k.get('param') or sqGet(API_KEY=self.API_KEY)
+        param = k.get('param') or self.search_title()
 
         if not k.get('param'):
             if isinstance(param, dict) and param['Type'] == 'series':
@@ -155,42 +264,23 @@ class Spreadsheet:
                 if not se:
                     return
                 
-                if isinstance(se, bool):
-                    if not param.get('totalSeasons') or param['totalSeasons'] == 'N/A':
-                        print("Error: Unable to get season data")
-                        return
-                    
-                    param['Episodes'] = []
-
-                    for i in range(1, int(param['totalSeasons'])+1):
-                        season = query({
-                            'i': param['imdbID'],
-                            'Season': i,
-                            'apikey': self.API_KEY
-                        })
-
-                        if not season:
-                            print(f"Failed to get data from season {i} of {param['Title']}")
-                            continue
-
-                        for episode in season['Episodes']:
-                            episode['eimdbID'] = episode['imdbID']
-                            episode['imdbID'] = param['imdbID']
-                            param['Episodes'].append(episode)
+                s, e = (se.get('s'), se.get('e')) if isinstance(se, dict) else (None, None)
+
+                if param.get('local'):
+                    # Tracked series, episodes are matched locally
+                    param['Episodes'] = [i for wk in self.worksheets for i in wk.series_entries(param['imdbID'], season=s, episode=e)]
+
+                    # No tracked episode matches, the series ID alone would match any of them
+                    if not param['Episodes']:
+                        return []
                 else:
-                    param = query({
-                        'i': param['imdbID'],
-                        'Season': se.get('s') if isinstance(se, dict) else None,
-                        'Episode': se.get('e') if isinstance(se, dict) else None,
-                        'apikey': self.API_KEY
-                    })
-
-                    if not param:
+                    episodes = get_series_store().episodes(param['imdbID'], season=s, episode=e, ms=param, API_KEY=self.API_KEY)
+
+                    if not episodes:
+                        print("Error: Unable to get season data")
                         return
-                    
-                    param['eimdbID'] = param['imdbID']
-                    param['imdbID'] = param['seriesID']
-                    param.pop('seriesID')
+
+                    param['Episodes'] = [dict(i, eimdbID=i['imdbID'], imdbID=param['imdbID']) for _, i in episodes]
 
         if not param:
             return
@@ -202,24 +292,48 @@ class Spreadsheet:
             raise IndexError(f"Error: Missing args - Title: {title}, ID: {ID}\nData: {param}")
 
         results = []
+        found = {}
 
-        def find(t, d):
-            data = i.find(sheet=t, param=d)
+        for x in param.get('Episodes') or [param]:
+            for wk, pos in self.locate(get_ID(x), ignore=k.get('ignore') or []):
+                found.setdefault(wk.title, []).append(wk.cache[pos])
 
-            if data:
+        # Keep worksheet order
+        for i in self.worksheets:
+            for data in found.get(i.title, []):
                 if not k.get('noprint'):
                     print(f'\nFound in worksheet: "{i.title}"\n{data}\n')
                 results.append(data)
-
-        for i in self.worksheets:            
-            if param.get('Episodes'):
-                for x in param['Episodes']:
-                    find(i.title, x)
-            else:
-                find(i.title, param)
                 
         return results
 
+    @operation
+    def manual_find(self, **k):
+        ''' Worksheet.manual_find across every worksheet, results in worksheet order
+
+        :param k[noprint]: don't print matches
+        '''
+
+        selected_type = k.get('selected_type') or select_row_title(self.row_titles)
+
+        if not selected_type:
+            return
+
+        if selected_type not in self.row_titles:
+            print('Error: Invalid data type')
+            return
+
+        data_to_find = k.get('data_to_find') or input('Input data to find: ')
+        results = []
+
+        for i in self.worksheets:
+            for data in i.manual_find(selected_type=selected_type, data_to_find=data_to_find) or []:
+                if not k.get('noprint'):
+                    print(f'\nFound in worksheet: "{i.title}"\n{data}\n')
+                results.append(data)
+
+        return results
+
     def count_data(self):
         m = input("Count all worksheets? Y/N: ")
         a = 0
@@ -235,72 +349,258 @@ class Spreadsheet:
 
         return a
 
+    @operation
     def clear_all_data(self):
         if input("Are you sure? Y/N: ").lower() == 'y':
-            for i in self.worksheets:
-                i.cache = []
+            with self.lock:
+                cleared = sum(len(i.cache) for i in self.worksheets)
+
+                for i in self.worksheets:
+                    i.cache = []
+
+            self.changed(cleared)
 
         return True
 
-    def load(self):
-        ''' Extracts google sheet data to local cache '''
+    def sync(self, modified):
+        ''' Re-reads only the row blocks changed since the last load/save
 
-        print('Loading data...')
+        :returns: True if caches are up to date, SYNC_PENDING if a changed sheet has
+            unsaved edits (nothing is read), None if a full load is needed
+        '''
 
-        failed = {}
+        probes = self.probe()
+
+        if not probes or not self.probes:
+            return
+
+        changed = {}
 
         for sheet in self.worksheets:
-            values = sheet.get_all_values()
+            old, new = self.probes.get(sheet.title), probes.get(sheet.title)
 
-            if len(values) <= 1:
-                if not values or values[0] != self.row_titles:
-                    sheet.update_to_row_titles()
+            if not old or not new:
+                return
 
+            blocks = sorted(b for b in old['blocks'].keys() | new['blocks'].keys() if old['blocks'].get(b) != new['blocks'].get(b))
+
+            if not blocks and old['rows'] == new['rows']:
                 continue
 
-            row_titles = [i for i in values[0] if i != '']
-            failed[sheet.title] = []
+            # Unsaved local edits would be overwritten or misaligned
+            if sheet.pending_changes():
+                return SYNC_PENDING
+
+            changed[sheet.title] = blocks
+
+        values = self.backend.read_blocks(changed) if changed else {}
+        caches = {}
+
+        for title, blocks in values.items():
+            rows = probes[title]['rows']
+            cache = self.worksheet(title).cache[:rows]
+
+            for b in sorted(blocks):
+                start = b * SYNC_BLOCK
+
+                if start > len(cache):
+                    return
+
+                cache[start:start+SYNC_BLOCK] = [Entry.from_row(row) for row in blocks[b]]
+
+            if len(cache) != rows:
+                return
+
+            caches[title] = cache
+
+        if caches:
+            # Anything a full load would drop (missing or duplicate IDs) falls back to it
+            IDs = [get_ID(e) for sheet in self.worksheets for e in caches.get(sheet.title, sheet.cache)]
+
+            if not all(IDs) or len(set(IDs)) != len(IDs):
+                return
+
+        for title, cache in caches.items():
+            sheet = self.worksheet(title)
+            sheet.cache = cache
+            sheet.mark_synced()
+
+        self.mark_synced(modified)
+
+        if caches:
+            self.write_snapshot(modified)
+            print(f'Data synced! Updated: {list(caches)}')
+        else:
+            print('Data up to date!')
+
+        return True
+
+    @operation
+    def load(self):
+        ''' Extracts stored data to local cache
+
+        All worksheets are read with one backend read (one batched values request
+        for google sheets), caches are rebuilt in a single pass and title rows are
+        only rewritten when they differ.
+
+        Once loaded, nothing is read if the stored data is unchanged, and backends
+        with change probes (see MS_T.backends) only send the changed row blocks
+        '''
+
+        with self.lock:
+            if self.loaded and self.synced is not None:
+                modified = self.modified_time()
+
+                if modified == self.synced:
+                    print('Data up to date!')
+                    return True
+
+                synced = self.sync(modified)
+
+                if synced == SYNC_PENDING:
+                    print('Error: Stored data changed while edits are unsaved, save before reloading')
+                    return
+
+                if synced:
+                    return True
+
+            # A full load replaces every cache
+            if self.loaded:
+                unsaved = [i.title for i in self.worksheets if i.pending_changes()]
+
+                if unsaved:
+                    print(f'Error: Unsaved changes in {unsaved}, save before reloading')
+                    return
+
+            print('Loading data...')
+
+            loaded, self.loaded = self.loaded, True
 
-            for row in values:                
-                if row == row_titles:
+            try:
+                row_titles = self.row_titles
+                modified = self.modified_time()
+                all_values = self.backend.read_all([i.title for i in self.worksheets])
+            except Exception:
+                # Empty caches must not pass for loaded ones, saving them would overwrite stored rows
+                self.loaded = loaded
+                raise
+        
+            seen, series = set(), set()
+            failed = {}
+            title_updates = []
+
+            for sheet in self.worksheets:
+                values = all_values.get(sheet.title, [])
+                failed[sheet.title] = []
+                cache = []
+
+                if not values or values[0] != row_titles:
+                    title_updates.append(sheet.title)
+
+                if len(values) <= 1:
+                    sheet.cache = cache
+                    sheet.mark_synced()
                     continue
 
-                row_data = {row_titles[i]: v for i, v in enumerate(row) if v != '' and i < len(row_titles)}
+                sheet_titles = [i for i in values[0] if i != '']
+                # Rows on the sheet stop matching cache positions after a skipped row or reordered titles
+                shifted_from = 0 if sheet_titles != row_titles else None
+
+                for row in values[1:]:
+                    if not any(row):
+                        shifted_from = len(cache) if shifted_from is None else shifted_from
+                        continue
+
+                    row_data = {sheet_titles[i]: v for i, v in enumerate(row) if v != '' and i < len(sheet_titles)}
+                    entry = Entry(row_data)
+                    ID = get_ID(entry)
+
+                    if not ID or ID in seen or ID in series:
+                        failed[sheet.title].append(entry['Title'])
+                        shifted_from = len(cache) if shifted_from is None else shifted_from
+                        continue
+
+                    seen.add(ID)
 
-                if not sheet.cache_append(param=row_data):
-                    failed[sheet.title].append(row_data['Title'])
+                    if ID != entry['imdbID']:
+                        series.add(entry['imdbID'])
 
-            sheet.update_to_row_titles()
+                    cache.append(entry)
 
-            if failed[sheet.title]:
-                print(f'Failed to load data to "{sheet.title}" worksheet:\n{failed[sheet.title]}')
+                sheet.cache = cache
+                sheet.mark_synced(rows=len(values)-1, shifted_from=shifted_from)
 
-        results = not [i for sheet in failed.values() for i in sheet]
+                if failed[sheet.title]:
+                    print(f'Failed to load data to "{sheet.title}" worksheet:\n{failed[sheet.title]}')
+
+            if title_updates:
+                self.backend.write_titles(title_updates)
+                modified = self.modified_time()
+
+            self.mark_synced(modified)
+            self.write_snapshot(modified)
+
+            results = not [i for sheet in failed.values() for i in sheet]
         
-        if results:
-            print('Data loaded!')
+            if results:
+                print('Data loaded!')
+
+    def enable_autosave(self, **k):
+        ''' Starts write-behind saving, see autosave.AutoSaver for options (interval, max_pending, max_backoff) '''
+
+        if not self.autosaver:
+            self.autosaver = AutoSaver(self, **k).start()
+
+        return self.autosaver
+
+    def disable_autosave(self):
+        ''' Stops write-behind saving after flushing pending changes '''
+
+        if self.autosaver:
+            self.autosaver.stop()
+            self.autosaver = None
+
+    def changed(self, n=1):
+        ''' Called by worksheets after n cache mutations '''
 
+        if self.autosaver:
+            self.autosaver.changed(n)
+
+    @operation
     def save(self):
-        ''' Updates google spreadsheet values with local data '''
-        
-        for sheet in self.worksheets:
-            vlen = len(sheet.col_values(1))
+        ''' Updates stored values with local data
+
+        Only rows changed since the last load/save are sent, as one backend batch.
+        With autosave on this is a barrier: it waits for a running flush and
+        returns once everything queued before it is written
+        '''
 
-            if vlen > 1:
-                sheet.batch_clear([f'A{2}:Z{vlen+1}'])
+        with self.lock:
+            self.ensure_loaded()
+            data = {sheet.title: sheet.pending_changes() for sheet in self.worksheets}
+            data = {t: v for t, v in data.items() if v}
 
-            if len(sheet.cache) > 0:
-                entries = []
+            if data:
+                self.backend.write_changes(data)
+
+            for sheet in self.worksheets:
+                sheet.mark_synced()
 
-                for v in sheet.cache:
-                    sorted_entry = [v[i] for i in self.row_titles if v.get(i)]
-                    entries.append(sorted_entry)
+            if data:
+                modified = self.modified_time()
 
-                sheet.batch_update([{'range': f'A2:Z{len(sheet.cache)+1}', 'values': entries}])
+                self.mark_synced(modified)
+                self.write_snapshot(modified)
+
+            if self.autosaver:
+                self.autosaver.saved()
 
         return True
 
-    def import_(self, wk):
+    @operation
+    def import_(self, wk, policy=None):
+        ''' Imports csv file of titles/imdbIDs into worksheet wk, see importer.import_file '''
+
         if not wk:
             return
 
@@ -309,52 +609,39 @@ class Spreadsheet:
         if not os.path.exists(file_path):
             print("Error: Failed to find path")
             return
-        
-        imported, failed = [], []
-
-        with open(file_path, 'r') as file:
-            csv_reader = csv.reader(file)
-            total = len([entry for row in csv_reader for entry in row if entry != ''])
-            accum = 1
 
-            # Reset file pointer to first line
-            file.seek(0)
+        while policy not in import_policies:
+            print('\n'.join([f'{i} - {v}' for i, v in import_policies.items()]))
+            policy = input('Select policy for title matches (default accept): ').lower() or 'accept'
 
-            for row in csv_reader:
-                for entry in row:
-                    if entry == '':
-                        continue
+        results = import_file(self, wk, file_path, policy=policy)
 
-                    print(
-                        f"\nImporting: {entry}\n{accum} out of {total} {'- Failed ' + str(len(failed)) if len(failed) >= 1 else ''}")
+        return not results['failed']
 
-                    r = wk.add(title=entry)
+    @operation
+    def export_(self, format=None, columns=None, filters=None, compress=None, dir_path=EXPORT_TITLE):
+        ''' Exports all worksheets to dir_path, see exporter.export_all
 
-                    if not r:
-                        failed.append(entry)
-                    else:
-                        imported.append(r)
+        Prompts for format, columns and compression when not given
+        '''
 
-                    accum += 1
+        while format not in export_formats:
+            print('\n'.join([f'{i} - {v}' for i, v in export_formats.items()]))
+            format = input('Select format (default csv): ').lower() or 'csv'
 
-        print(f"\nImported {len(imported)} out of {total} " +
-              f"{'- Failed: ' + str(len(failed)) if failed else ''} {failed if failed else ''}")
-        
-        return not failed
+        if columns is None:
+            columns = [i.strip() for i in input(f'Columns to export, comma separated (default all)\n{self.row_titles}: ').split(',') if i.strip()]
 
-    def export_(self):
-        if not os.path.exists(EXPORT_TITLE):
-            os.makedirs(EXPORT_TITLE)
+        if compress is None:
+            compress = input('Compress with gzip? Y/N: ').lower() == 'y'
 
-        for sheet, list in self.worksheets():
-            if len(list) < 1:
-                continue
-
-            with open(f'{EXPORT_TITLE}/{sheet}.csv', 'w') as file:
-                csv_writer = csv.writer(file)
+        try:
+            results = export_all(self, dir_path, format=format, columns=columns or None, filters=filters, compress=compress)
+        except ValueError as e:
+            print(f'Error: {e}')
+            return
 
-                for i in range(0, len(list), MAX_ENTRIES_PER_ROW):
-                    row = list[i:i+MAX_ENTRIES_PER_ROW]
-                    csv_writer.writerow(row)
+        for title, (path, n) in results.items():
+            print(f'Exported {n} entries from "{title}" to: {path}')
 
         return True
\ No newline at end of file
@@ -0,0 +1,196 @@
+''' Call instrumentation: timing, counts, payload sizes and errors of gspread and omdb calls
+
+Calls are grouped by (call, operation), the operation being the innermost
+Spreadsheet/Worksheet method tagged with @operation that is running
+'''
+
+import os
+import json
+import time
+import threading
+import contextvars
+import functools
+from collections import deque
+
+# Latencies kept per (call, operation) for percentiles
+MAX_SAMPLES = 10000
+PERCENTILES = (50, 95, 99)
+stats_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'stats.json')
+
+current_operation = contextvars.ContextVar('current_operation', default=None)
+
+def payload_size(obj) -> int:
+    ''' Approximate size in bytes of request/response data (strings, numbers, lists, dicts) '''
+
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+
+    if isinstance(obj, dict):
+        return sum(payload_size(k) + payload_size(v) for k, v in obj.items())
+
+    if isinstance(obj, (list, tuple)):
+        # Fast path for rows of cells
+        if obj and isinstance(obj[0], str):
+            try:
+                return sum(map(len, obj))
+            except TypeError:
+                pass
+
+        return sum(payload_size(i) for i in obj)
+
+    if isinstance(obj, (int, float)):
+        return len(str(obj))
+
+    return 0
+
+def percentile(samples, p):
+    ''' Nearest-rank percentile of sorted samples '''
+
+    if not samples:
+        return None
+
+    return samples[max(0, -(-len(samples) * p // 100) - 1)]
+
+class CallStats:
+    def __init__(self, max_samples=MAX_SAMPLES) -> None:
+        ''' Thread-safe counters per (call, operation) '''
+
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+
+    def record(self, call, elapsed, size=0, error=None, op=None):
+        key = (call, op or current_operation.get() or '-')
+
+        with self.lock:
+            c = self.calls.get(key)
+
+            if c is None:
+                c = self.calls[key] = {'count': 0, 'errors': 0, 'bytes': 0, 'time': 0.0, 'samples': deque(maxlen=self.max_samples)}
+
+            c['count'] += 1
+            c['bytes'] += size
+            c['time'] += elapsed
+            c['samples'].append(elapsed)
+
+            if error is not None:
+                c['errors'] += 1
+
+    def summary(self) -> list:
+        ''' [{call, operation, count, errors, bytes, total, p50, p95, p99}] sorted by total time '''
+
+        with self.lock:
+            calls = [(k, dict(v, samples=sorted(v['samples']))) for k, v in self.calls.items()]
+
+        rows = []
+
+        for (call, op), c in calls:
+            row = {'call': call, 'operation': op, 'count': c['count'], 'errors': c['errors'], 'bytes': c['bytes'], 'total': c['time']}
+            row.update({f'p{p}': percentile(c['samples'], p) for p in PERCENTILES})
+            rows.append(row)
+
+        return sorted(rows, key=lambda r: r['total'], reverse=True)
+
+    def report(self) -> str:
+        rows = self.summary()
+
+        if not rows:
+            return 'No calls recorded'
+
+        lines = [f"{'Call':<28}{'Operation':<14}{'Count':>7}{'Errors':>7}{'Bytes':>11}{'Total (s)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"]
+
+        for r in rows:
+            lines.append(
+                f"{r['call']:<28}{r['operation']:<14}{r['count']:>7}{r['errors']:>7}{r['bytes']:>11}{r['total']:>11.3f}"
+                + ''.join(f"{r[f'p{p}'] * 1000:>10.1f}" for p in PERCENTILES)
+            )
+
+        return '\n'.join(lines)
+
+    def dump(self, path=stats_path):
+        ''' Writes summary as json, returns path '''
+
+        with open(path, 'w') as file:
+            json.dump({'generated': time.time(), 'calls': self.summary()}, file, indent=2)
+
+        return path
+
+stats = CallStats()
+
+def get_stats():
+    return stats
+
+def timed(call, fn, *args, **kwargs):
+    ''' Runs fn(*args, **kwargs) recording it as call, size counts arguments and result '''
+
+    start = time.perf_counter()
+
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        stats.record(call, time.perf_counter() - start, size=payload_size([args, kwargs]), error=e)
+        raise
+
+    stats.record(call, time.perf_counter() - start, size=payload_size([args, kwargs, result]))
+    return result
+
+def operation(func):
+    ''' Tags calls made while func runs with its name and records func itself as call "operation" '''
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(func.__name__)
+        start = time.perf_counter()
+        error = None
+
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            stats.record('operation', time.perf_counter() - start, error=error)
+            current_operation.reset(token)
+
+    return wrapper
+
+def carry_context(fn):
+    ''' Wraps fn for worker threads so calls keep the submitting operation tag '''
+
+    context = contextvars.copy_context()
+
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+class Instrumented:
+    def __init__(self, obj, prefix) -> None:
+        ''' Proxy timing every method call of a gspread object as "<prefix>.<method>" '''
+
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_prefix', prefix)
+
+    def __getattr__(self, __name):
+        attr = getattr(self._obj, __name)
+
+        if not callable(attr) or __name.startswith('_'):
+            return attr
+
+        return functools.partial(timed, f'{self._prefix}.{__name}', attr)
+
+    def __setattr__(self, __name, __value):
+        setattr(self._obj, __name, __value)
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __eq__(self, other):
+        return self._obj == (other._obj if isinstance(other, Instrumented) else other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+def instrument(obj, prefix):
+    return obj if obj is None or isinstance(obj, Instrumented) else Instrumented(obj, prefix)
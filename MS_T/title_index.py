@@ -0,0 +1,109 @@
+import re
+
+# Dice similarity of title trigrams needed for a local match to be used without asking omdb
+CONFIDENT_SCORE = 0.7
+# ...and how far ahead of the next best title it has to be
+CONFIDENT_MARGIN = 0.1
+episode_title_pattern = re.compile(r"^'(.*)': S\d+E\d+")
+non_alnum_pattern = re.compile(r'[^0-9a-z]+')
+
+def normalize(title):
+    return non_alnum_pattern.sub(' ', str(title).lower()).strip()
+
+def trigrams(title):
+    padded = f' {normalize(title)} '
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+def numbers(title):
+    ''' Numeric words, sequels ("Toy Story 2") never match on similarity alone '''
+
+    return {i for i in normalize(title).split() if i.isdigit()}
+
+def base_title(entry):
+    ''' Movie title, or series title for episode entries ("'Loki': S1E1 - ..." -> "Loki") '''
+
+    match = episode_title_pattern.match(entry['Title'])
+    return match.group(1) if match else entry['Title']
+
+class TitleIndex:
+    def __init__(self) -> None:
+        ''' Trigram index over tracked titles for ranked fuzzy matching
+
+        One document per imdbID (episodes count towards their series),
+        reference counted so entries can be added and removed one at a time
+        '''
+
+        self.docs = {}
+        self.grams = {}
+
+    def add(self, entry):
+        ID = entry['imdbID']
+
+        if ID == 'N/A':
+            return
+
+        doc = self.docs.get(ID)
+
+        if doc:
+            doc['refs'] += 1
+            return
+
+        title = base_title(entry)
+        grams = trigrams(title)
+        self.docs[ID] = {'Title': title, 'imdbID': ID, 'Type': entry['Type'], 'grams': len(grams), 'refs': 1}
+
+        for g in grams:
+            self.grams.setdefault(g, set()).add(ID)
+
+    def remove(self, entry):
+        doc = self.docs.get(entry['imdbID'])
+
+        if not doc:
+            return
+
+        doc['refs'] -= 1
+
+        if doc['refs']:
+            return
+
+        del self.docs[doc['imdbID']]
+
+        for g in trigrams(doc['Title']):
+            IDs = self.grams.get(g)
+
+            if IDs is not None:
+                IDs.discard(doc['imdbID'])
+
+                if not IDs:
+                    del self.grams[g]
+
+    def search(self, title, limit=5) -> list:
+        ''' Returns [(score, doc)] best first, score in 0-1 '''
+
+        query = trigrams(title)
+        counts = {}
+
+        for g in query:
+            for ID in self.grams.get(g, ()):
+                counts[ID] = counts.get(ID, 0) + 1
+
+        ranked = sorted(((2 * n / (len(query) + self.docs[ID]['grams']), self.docs[ID]) for ID, n in counts.items()), key=lambda i: i[0], reverse=True)
+        return ranked[:limit]
+
+    def best(self, title):
+        ''' Returns omdb-like result for a confident match, otherwise None '''
+
+        ranked = self.search(title, limit=2)
+
+        if not ranked or ranked[0][0] < CONFIDENT_SCORE:
+            return
+
+        if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < CONFIDENT_MARGIN:
+            return
+
+        doc = ranked[0][1]
+
+        if numbers(title) != numbers(doc['Title']):
+            return
+
+        return {'Title': doc['Title'], 'imdbID': doc['imdbID'], 'Type': doc['Type'], 'Response': 'True', 'local': True}
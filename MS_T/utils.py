@@ -1,7 +1,14 @@
 import os
 import re
-import requests
-
+import copy
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .cache import get_query_cache, QueryCache
+from .omdb import get_client, QuotaExceeded
+from .stats import get_stats, payload_size, carry_context
+
+MAX_PARALLEL_REQUESTS = 8
 imdbID_pattern = re.compile(r'^tt\d+$', re.IGNORECASE)
 season_episode_modecmds =\
 '''
@@ -30,6 +37,11 @@ def re_dirname(filepath, n):
     
     return path
 
+def get_ID(param):
+    ''' Returns entry ID (eimdbID if episode, else imdbID) '''
+
+    return param['eimdbID'] if param.get('eimdbID') and param['eimdbID'] != 'N/A' else param.get('imdbID')
+
 def get_season_episode(season_cap=None):
         season_cap = int(season_cap) if season_cap and season_cap != 'N/A' else None
 
@@ -104,9 +116,58 @@ def msdb_user_confirm(text):
         else:
             print("Error: Invalid input")
 
-def query(params:dict=None) -> dict:
+class SingleFlight:
+    def __init__(self) -> None:
+        ''' Coalesces concurrent calls with the same key into one call
+
+        The first caller runs the call, callers arriving while it is in flight wait
+        for it and get a deep copy of its result (or its exception)
+        '''
+
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self.calls[key] = {'done': threading.Event()}
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+
+            if 'error' in call:
+                raise call['error']
+
+            return copy.deepcopy(call['result'])
+
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+            call['done'].set()
+
+inflight_queries = SingleFlight()
+
+def query(params:dict=None, use_cache=True, refresh=False) -> dict:
     ''' Search omdb for movie/series entry with specified params
 
+    Responses (including "not found") are kept in the local query cache,
+    pass use_cache=False to bypass it (neither read nor written) or
+    refresh=True to skip the cached response but store the new one.
+    Identical queries already in flight are shared instead of sent again.
+
     :param apikey: apikey
 
     ONE REQUIRED
@@ -206,18 +267,90 @@ def query(params:dict=None) -> dict:
     if not params.get('apikey'):
         raise IndexError('Missing apikey')
 
-    base_url = "https://www.omdbapi.com/"
-    results = requests.get(base_url, params)
+    start = time.perf_counter()
+    data = inflight_queries.do((QueryCache.key(params), use_cache, refresh), lambda: fetch(params, use_cache, refresh))
+
+    get_stats().record('omdb.query', time.perf_counter() - start, size=payload_size(data), error=None if data else 'failed')
+    return data
+
+def fetch(params, use_cache=True, refresh=False):
+    ''' Runs query without coalescing, see query '''
+
+    import requests
+
+    if use_cache and not refresh:
+        results_json = get_query_cache().get(params)
+
+        if results_json:
+            if results_json['Response'] == 'True':
+                return results_json
+
+            print(f'Failed to query\nResults: cached\nJson: {results_json}')
+            return
+
+    try:
+        results = get_client().get_sync(params)
+    except (requests.RequestException, QuotaExceeded) as e:
+        print(f'Failed to query\nError: {e}')
+        return
+
     results_json = None
     
     if results.status_code == 200:
         results_json = results.json()
+
+        if use_cache:
+            get_query_cache().set(params, results_json)
         
         if results_json['Response'] == 'True':
             return results_json
         
     print(f'Failed to query\nResults: {results}\nJson: {results_json}')
 
+def query_seasons(imdbID, total_seasons, title=None, API_KEY=None, max_parallel=None, seasons=None) -> list:
+    ''' Queries seasons 1 to total_seasons (or only seasons) of a series concurrently
+
+    Failed seasons are reported and left out, nothing is fetched if the
+    uncached seasons would exceed the remaining daily quota
+
+    :param max_parallel: max requests in flight (default MAX_PARALLEL_REQUESTS)
+    :param seasons: season numbers to query instead of all
+
+    :returns: [(season #, season data), ...] in season order
+    :rtype: list
+    '''
+
+    seasons = sorted(int(i) for i in seasons) if seasons else range(1, int(total_seasons)+1)
+    uncached = [n for n in seasons if not get_query_cache().get({'i': imdbID, 'Season': n})]
+
+    # Refuse up front rather than running out of quota mid-series
+    try:
+        get_client().ensure_quota(len(uncached), API_KEY)
+    except QuotaExceeded as e:
+        print(f"Failed to get season data of {title or imdbID}\nError: {e}")
+        return []
+
+    def get_season(n):
+        return query({
+            'i': imdbID,
+            'Season': n,
+            'apikey': API_KEY
+        })
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel or MAX_PARALLEL_REQUESTS, len(seasons)))) as executor:
+        results = list(executor.map(carry_context(get_season), seasons))
+
+    fetched = []
+
+    for n, season in zip(seasons, results):
+        if not season:
+            print(f"Failed to get data from season {n} of {title or imdbID}")
+            continue
+
+        fetched.append((n, season))
+
+    return fetched
+
 def search_by_title(title=None, API_KEY=None):
     title = title or input("Enter movie/series (c to cancel): ")
 
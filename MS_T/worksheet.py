@@ -1,12 +1,18 @@
 from .utils import (
-    query,
     sqGet,
     msdb_user_confirm,
     imdbID_pattern,
-    get_season_episode
+    get_season_episode,
+    get_ID
 )
+from .series import get_series_store
+from .entry import Entry
+from .stats import operation
 from datetime import (date, datetime)
 
+# Share of cache rows that, once changed, makes save rewrite the whole sheet in one span
+FULL_REWRITE_RATIO = 0.5
+
 immutable_titles = [
     'imdbID',
     'Season',
@@ -14,24 +20,59 @@ immutable_titles = [
     'eimdbID'
 ]
 
+def select_row_title(row_titles):
+    ''' Prompts for a row title by number or name, None if cancelled '''
+
+    while True:
+        print("Select data type to search by")
+        print('\n'.join([f'{i+1}. {v}' for i, v in enumerate(row_titles)]))
+        v = input("Selection (c to cancel): ")
+
+        if v.lower() == 'c':
+            return
+
+        try:
+            v = int(v)
+
+            if v < 1 or v > len(row_titles):
+                print('Error: Invalid input')
+                continue
+            
+            return row_titles[v-1]
+        except:
+            for i in row_titles:
+                if i.lower() == v.lower():
+                    return i
+
+            print('Error: Invalid input')
+
 class Worksheet:
-    def __init__(self, spreadsheet, gspread_class, API_KEY=None) -> None:
+    def __init__(self, spreadsheet, gspread_class=None, API_KEY=None, title=None) -> None:
         ''' Gspread 'worksheet' class extension
 
+        gspread_class is None for backends without gspread worksheets
+
         More info: https://docs.gspread.org/en/latest/api/models/worksheet.html
         '''
 
         self.spreadsheet = spreadsheet
         self.g = gspread_class
-        self.cache = []
+        self.title = title or gspread_class.title
         self.API_KEY = API_KEY
+        self._index = {}
+        self._series = {}
+        self._columns = {}
+        self._synced_rows = 0
+        self._dirty = set()
+        self._shifted_from = None
+        self.cache = []
 
-    def __getattribute__(self, __name: str):
-        try:
-            return super().__getattribute__(__name)
-        except AttributeError:
-            if hasattr(self.g, __name):
-                return getattr(self.g, __name)
+    def __getattr__(self, __name: str):
+        # Only reached when normal lookup fails, falls back to the gspread object
+        if __name not in ('g',) and not __name.startswith('_') and hasattr(self.g, __name):
+            return getattr(self.g, __name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{__name}'")
     
     @property
     def next_empty_row(self) -> int:
@@ -50,11 +91,185 @@ class Worksheet:
     @property
     def values(self):
         return self.cache
+
+    @property
+    def cache(self):
+        self.spreadsheet.ensure_loaded()
+        return self._cache
+
+    @cache.setter
+    def cache(self, entries):
+        self._cache = [i if isinstance(i, Entry) else Entry(i) for i in entries]
+        self._shifted_from = 0
+        self.reindex()
+
+    def mark_synced(self, rows=None, shifted_from=None):
+        ''' Records that the sheet holds the cache as of now
+
+        :param rows: data rows on the sheet (default len(cache))
+        :param shifted_from: cache position from which sheet rows still differ
+        '''
+
+        self._synced_rows = len(self._cache) if rows is None else rows
+        self._dirty = set()
+        self._shifted_from = shifted_from
+
+    def pending_changes(self):
+        ''' Returns rows changed since last load/save, None if nothing changed
+
+        Inserted and modified rows are grouped in contiguous spans and rows shifted
+        by removals are included. Falls back to a single full span once most rows changed.
+
+        :returns: {'spans': [(cache position, [rows])], 'size': len(cache), 'synced_rows': #}
+        '''
+
+        n = len(self._cache)
+        rows = {i for i in self._dirty if i < n}
+
+        if self._shifted_from is not None:
+            rows.update(range(self._shifted_from, n))
+
+        if not rows and self._synced_rows <= n:
+            return
+
+        if len(rows) > n * FULL_REWRITE_RATIO:
+            rows = range(min(rows), n)
+
+        spans = []
+
+        for i in sorted(rows):
+            if spans and spans[-1][1] == i-1:
+                spans[-1][1] = i
+            else:
+                spans.append([i, i])
+
+        return {
+            'spans': [(a, [v.row() for v in self._cache[a:b+1]]) for a, b in spans],
+            'size': n,
+            'synced_rows': self._synced_rows
+        }
+
+    def reindex(self, start=0):
+        ''' Rebuilds ID lookup tables for cache entries from position start
+
+        _index: entry ID (eimdbID or imdbID) -> cache position
+        _series: series imdbID -> entry IDs of its episodes, in cache order
+        _columns: secondary indexes, see column_index (dropped on full reindex)
+        '''
+
+        if start == 0:
+            for ID in [*self._index, *self._series]:
+                self.spreadsheet.unregister(ID, self)
+
+            self.spreadsheet.reset_titles()
+
+            self._index = {}
+            self._series = {}
+            self._columns = {}
+
+            for pos, entry in enumerate(self._cache):
+                self._index_add(pos, entry)
+
+            return
+
+        # Entries past start shifted down by one, existing positions only move left
+        for pos in range(start, len(self._cache)):
+            ID = get_ID(self._cache[pos])
+            current = self._index.get(ID)
+
+            if current is None or current > pos:
+                self._index[ID] = pos
+
+    def _index_add(self, pos, entry):
+        ID = get_ID(entry)
+
+        if ID not in self._index:
+            self._index[ID] = pos
+            self.spreadsheet.register(ID, self)
+
+        if ID != entry.get('imdbID') and entry.get('imdbID') not in (None, 'N/A'):
+            if entry['imdbID'] not in self._series:
+                self._series[entry['imdbID']] = {}
+                self.spreadsheet.register(entry['imdbID'], self)
+
+            self._series[entry['imdbID']][ID] = None
+
+        for title, column in self._columns.items():
+            column.setdefault(entry[title], {})[id(entry)] = entry
+
+        self.spreadsheet.register_title(entry)
+
+    def _index_remove(self, entry):
+        ID = get_ID(entry)
+
+        if self._index.pop(ID, None) is not None:
+            self.spreadsheet.unregister(ID, self)
+
+        episodes = self._series.get(entry.get('imdbID'))
+
+        if episodes is not None and ID != entry['imdbID']:
+            episodes.pop(ID, None)
+
+            if not episodes:
+                del self._series[entry['imdbID']]
+                self.spreadsheet.unregister(entry['imdbID'], self)
+
+        for title, column in self._columns.items():
+            matches = column.get(entry[title])
+
+            if matches is not None:
+                matches.pop(id(entry), None)
+
+                if not matches:
+                    del column[entry[title]]
+
+        self.spreadsheet.unregister_title(entry)
+
+    def index_of(self, ID):
+        ''' Returns cache position of first entry with imdbID or eimdbID matching ID '''
+
+        self.spreadsheet.ensure_loaded()
+        pos = self._index.get(ID)
+        episodes = self._series.get(ID)
+
+        if episodes:
+            first = self._index[next(iter(episodes))]
+            pos = first if pos is None else min(pos, first)
+
+        return pos
     
+    def series_entries(self, imdbID, season=None, episode=None):
+        ''' Returns tracked episodes of series imdbID in cache order, optionally of one season/episode '''
+
+        entries = [self.cache[self._index[ID]] for ID in self._series.get(imdbID, {})]
+
+        return [
+            i for i in entries
+            if (season is None or str(i['Season']) == str(season)) and (episode is None or str(i['Episode']) == str(episode))
+        ]
+
+    def column_index(self, title):
+        ''' Returns {value: {id(entry): entry}} for column title, built on first use
+
+        Kept up to date on append/remove, matches stay in cache order
+        '''
+
+        column = self._columns.get(title)
+
+        if column is None:
+            column = {}
+
+            for entry in self.cache:
+                column.setdefault(entry[title], {})[id(entry)] = entry
+
+            self._columns[title] = column
+
+        return column
+
     def update_to_row_titles(self):
-        self.g.batch_clear(['A1:Z1'])
-        self.g.update('A1:Z1', [self.spreadsheet.row_titles])      
+        self.spreadsheet.backend.write_titles([self.title])
 
+    @operation
     def find(self, **k):
         ''' Returns entry where found
 
@@ -84,10 +299,10 @@ class Worksheet:
         ID = None
         
         if param:
-            ID = param['eimdbID'] if param.get('eimdbID') and param['eimdbID'] != 'N/A' else param.get('imdbID')
+            ID = get_ID(param)
 
         if not ID:         
-            ms = sqGet(API_KEY=self.API_KEY)
+            ms = self.spreadsheet.search_title()
 
             if not ms: 
                 return
@@ -97,56 +312,41 @@ class Worksheet:
 
                 if not se:
                     return
-                
-                seInfo = query({
-                    'i': ms['imdbID'],
-                    'Season': se.get('s') if isinstance(se, dict) else None,
-                    'Episode': se.get('e') if isinstance(se, dict) else None,
-                    'apikey': self.API_KEY
-                })
 
-                if not seInfo:
-                    return
-                
-                if isinstance(se, bool):
-                    if not seInfo.get('totalSeasons') or seInfo['totalSeasons'] == 'N/A':
-                        print("Error: Unable to get season data")
-                        return
-                    
-                    seInfo['Episodes'] = []
+                s, e = (se.get('s'), se.get('e')) if isinstance(se, dict) else (None, None)
 
-                    for i in range(1, int(seInfo['totalSeasons'])+1):
-                        season = query({
-                            'i': ms['imdbID'],
-                            'Season': i,
-                            'apikey': self.API_KEY
-                        })
+                if ms.get('local'):
+                    # Tracked series, episodes are matched locally
+                    entries = self.series_entries(ms['imdbID'], season=s, episode=e)
 
-                        if not season:
-                            print(f"Failed to get data from season {i} of {ms['Title']}")
-                            continue
+                    if e:
+                        return self.find(param=entries[0], index=k.get('index')) if entries else None
 
-                        for i in season['Episodes']:
-                            seInfo['Episodes'].append(i)
+                    return entries or None
+                
+                episodes = get_series_store().episodes(ms['imdbID'], season=s, episode=e, ms=ms, API_KEY=self.API_KEY)
 
-                elif se.get('e'):
+                if not episodes:
+                    print("Error: Unable to get season data")
+                    return
+
+                if e:
                     return self.find(param={
                         'imdbID': ms['imdbID'],
-                        'eimdbID': seInfo['imdbID']
+                        'eimdbID': episodes[0][1]['imdbID']
                     }, ignore=k.get('ignore'))
 
-                if seInfo.get('Episodes'):
-                    values = []
+                values = []
 
-                    for i in seInfo['Episodes']:
-                        values.append(
-                            self.find(
-                                    param={'imdbID': ms['imdbID'], 'eimdbID': i['imdbID']}, 
-                                    ignore=k.get('ignore')
-                                ) or None
-                        )
+                for _, i in episodes:
+                    values.append(
+                        self.find(
+                                param={'imdbID': ms['imdbID'], 'eimdbID': i['imdbID']}, 
+                                ignore=k.get('ignore')
+                            ) or None
+                    )
 
-                    return values
+                return values
             else:
                 if ms.get('seriesID'):
                     print('\nNOTE - Searching by episode imdbID unadvised (inconsistant/inaccurate omdb results)\n')
@@ -156,45 +356,37 @@ class Worksheet:
 
                 return self.find(param=ms, ignore=k.get('ignore'))
         elif (not k.get('ignore') or self.title not in k['ignore']) and len(self.cache) > 0:
-            for i, v in enumerate(self.cache):
-                if v['eimdbID'] == ID or v['imdbID'] == ID:
-                    return i if k.get('index') else v
+            i = self.index_of(ID)
+
+            if i is not None:
+                return i if k.get('index') else self.cache[i]
     
+    @operation
     def manual_find(self, **k):
-        def get_row_input():
-            while True:
-                print("Select data type to search by")
-                print('\n'.join([f'{i+1}. {v}' for i, v in enumerate(self.spreadsheet.row_titles)]))
-                v = input("Selection (c to cancel): ")
+        ''' Returns all entries with a column exactly matching, without querying
 
-                if v.lower() == 'c':
-                    return
+        :param k[selected_type]: row title (prompted if missing)
+        :param k[data_to_find]: value (prompted if missing)
+        :param k[all_worksheets]: search every worksheet, see Spreadsheet.manual_find
 
-                try:
-                    v = int(v)
+        :rtype: list
+        '''
 
-                    if v < 1 or v > len(self.spreadsheet.row_titles):
-                        print('Error: Invalid input')
-                        continue
-                    
-                    return self.spreadsheet.row_titles[v-1]
-                except:
-                    for i in self.spreadsheet.row_titles:
-                        if i.lower() == v.lower():
-                            return i
-
-                    print('Error: Invalid input')
-                
-        selected_type = k.get('selected_type', get_row_input())
+        if k.get('all_worksheets'):
+            return self.spreadsheet.manual_find(**{i: v for i, v in k.items() if i != 'all_worksheets'})
+
+        selected_type = k.get('selected_type') or select_row_title(self.spreadsheet.row_titles)
 
         if not selected_type:
             return
+
+        if selected_type not in self.spreadsheet.row_titles:
+            print('Error: Invalid data type')
+            return
                 
-        data_to_find = k.get('data_to_find', input('Input data to find: '))
+        data_to_find = k.get('data_to_find') or input('Input data to find: ')
 
-        for data in self.cache:
-            if data[selected_type] == data_to_find:
-                return data
+        return list(self.column_index(selected_type).get(data_to_find, {}).values())
     
     def cache_append(self, **k):
         param = k.get('param')
@@ -202,23 +394,27 @@ class Worksheet:
         if not param:
             raise IndexError("Error: Missing param")
         
-        new_param = {}
-        
         # Update param with/without missing or extra data
-        for t in self.spreadsheet.row_titles:
-            new_param[t] = param.get(t) or 'N/A'
+        new_param = Entry(param)
         
         if self.spreadsheet.get_dupes(param=new_param, ignore=k.get('ignore')):
             return       
         
-        self.cache.append(new_param)
-        return self.cache[-1]
+        with self.spreadsheet.lock:
+            self._cache.append(new_param)
+            self._index_add(len(self._cache)-1, new_param)
+            self._dirty.add(len(self._cache)-1)
+
+        self.spreadsheet.changed()
+        return new_param
 
+    @operation
     def add(self, **k) -> list|dict:
         ''' Adds or returns data of user entered movie/series 
         
         :param k['title']: Movie/Show title
         :param k['param']: MST Entry
+        :param k['se']: Series mode without prompting (True for all seasons, or {'s': #, 'e': #})
 
         :returns: New entry data
         :rtype: dict
@@ -246,23 +442,21 @@ class Worksheet:
 
             return self.cache_append(param=param)
         elif ms['Type'] == 'series':
-            se = {'s': ms['Season'], 'e': ms.get('Episode')} if ms.get('Season') else get_season_episode(season_cap=ms.get('totalSeasons'))
+            se = {'s': ms['Season'], 'e': ms.get('Episode')} if ms.get('Season') else k.get('se') or get_season_episode(season_cap=ms.get('totalSeasons'))
 
             if not se:
                 return
             
-            seInfo = query({
-                'i': ms['imdbID'],
-                'Season': se.get('s') if isinstance(se, dict) else None,
-                'Episode': se.get('e') if isinstance(se, dict) else None,
-                'apikey': self.API_KEY
-            })
+            store = get_series_store()
+            s, e = (se.get('s'), se.get('e')) if isinstance(se, dict) else (None, None)
+            seasons = store.seasons(ms['imdbID'], seasons=[s] if s else None, ms=ms, API_KEY=self.API_KEY)
 
-            if not seInfo:
+            if not seasons:
+                print("Error: Unable to get season data")
                 return
-                        
+
             def add_all_episodes(season, episodes):
-                results = []
+                new_params = []
 
                 for i in (episodes):
                     new_param = param.copy()
@@ -273,50 +467,32 @@ class Worksheet:
                         'Episode': i['Episode'],
                         'eimdbID': i['imdbID']
                     })
+                    new_params.append(new_param)
 
-                    r = self.cache_append(param=new_param)
-
-                    if r:
-                        results.append(r)
-
-                if results:
-                    return results
+                return self.add_many(new_params) or None
             
             if isinstance(se, bool):
                 # Add all seasons
-                if not seInfo.get('totalSeasons') or seInfo['totalSeasons'] == 'N/A':
-                    print("Error: Unable to get season data")
-                    return
-
                 results = []
 
-                for n in range(1, int(seInfo['totalSeasons'])+1):
-                    episodes = []
-
-                    season_data = query({
-                        'i': ms['imdbID'],
-                        'Season': n,
-                        'apikey': self.API_KEY
-                    })
-
-                    if not season_data:
-                        print(f"Failed to get data from season {n} of {ms['Title']}")
-                        continue
-
-                    for i in season_data['Episodes']:
-                        episodes.append(i)
-
+                for n, episodes in seasons:
                     r = add_all_episodes(season=n, episodes=episodes)
 
                     if r:
                         results.append(r)
 
                 return results            
-            elif seInfo.get('Episodes'):
+            elif not e:
                 # Add all episodes  
-                return add_all_episodes(season=se['s'], episodes=seInfo['Episodes'])
+                return add_all_episodes(season=se['s'], episodes=seasons[0][1])
             else:
                 # Add single episode
+                seInfo = next((i for i in seasons[0][1] if str(i['Episode']) == str(e)), None)
+
+                if not seInfo:
+                    print(f"Error: Unable to find episode {e} of season {s}")
+                    return
+
                 param.update({
                     'Title': f"'{ms['Title']}': S{se['s']}E{se['e']} - {seInfo['Title']}",
                     'Link': f"https://www.imdb.com/title/{seInfo['imdbID']}/",
@@ -332,13 +508,16 @@ class Worksheet:
             print('\nNOTE - Adding episode by imdbID unadvised (inconsistent/inaccurate omdb results)\n')
 
             if not seInfo.get('seriesID') or seInfo['seriesID'] == 'N/A':
-                print('Error: Unable to get season data')
-                return
+                # omdb sometimes leaves it out, stored seasons know the series
+                stored = get_series_store().series_of(seInfo['imdbID'])
 
-            ms = query({
-                'i': seInfo.get('seriesID'),
-                'apikey': self.API_KEY
-            })
+                if not stored:
+                    print('Error: Unable to get season data')
+                    return
+
+                seInfo.update(seriesID=stored['imdbID'], Season=stored['Season'], Episode=stored['Episode'])
+
+            ms = get_series_store().series(seInfo['seriesID'], API_KEY=self.API_KEY)
 
             if not ms:
                 return
@@ -354,6 +533,7 @@ class Worksheet:
 
             return self.cache_append(param=param)
             
+    @operation
     def manual_add(self):
         entry = {}
         skip_options = {'s', 'skip', 'n/a'}
@@ -424,8 +604,219 @@ class Worksheet:
         i = self.find(param=param, index=True)
 
         if isinstance(i, int):
-            return self.cache.pop(i)
+            with self.spreadsheet.lock:
+                entry = self._cache.pop(i)
+                self._index_remove(entry)
+                self.reindex(start=i)
+
+                if self._shifted_from is None or i < self._shifted_from:
+                    self._shifted_from = i
+
+            self.spreadsheet.changed()
+            return entry
+
+    def _column_move(self, title, old, entry, pos):
+        ''' Moves entry from value old to its current value in column index title, keeping matches in cache order '''
+
+        column = self._columns[title]
+        matches = column.get(old)
+
+        if matches is not None:
+            matches.pop(id(entry), None)
+
+            if not matches:
+                del column[old]
+
+        matches = column.setdefault(entry[title], {})
+
+        # Appending is the common case, otherwise the bucket is rebuilt around pos
+        if not matches or self._index[get_ID(next(reversed(matches.values())))] < pos:
+            matches[id(entry)] = entry
+            return
+
+        items = list(matches.items())
+        at = next(n for n, (_, v) in enumerate(items) if self._index[get_ID(v)] > pos)
+        items.insert(at, (id(entry), entry))
+
+        matches.clear()
+        matches.update(items)
+
+    def cache_update(self, param, **fields):
+        ''' Changes fields of the cache entry matching param in place
+
+        The row keeps its position, only indexes over the changed columns are
+        updated and just that row is written on the next save
+
+        Example:
+        >>> wk.cache_update({'imdbID': 'tt1517268'}, Date='Monday, January 01, 2024')
+
+        :returns: updated entry, None if not found
+        :raises IndexError: missing ID or an immutable title in fields
+        '''
+
+        locked = [t for t in fields if t in immutable_titles]
+
+        if locked:
+            raise IndexError(f'Error: Unable to change {locked}')
+
+        if not param.get('eimdbID') and not param.get('imdbID'):
+            raise IndexError(f'Error: Unable to get ID\n{param}')
+
+        i = self.index_of(get_ID(param))
+
+        if i is None:
+            return
+
+        with self.spreadsheet.lock:
+            entry = self._cache[i]
+            titled = 'Title' in fields or 'Type' in fields
+
+            if titled:
+                self.spreadsheet.unregister_title(entry)
+
+            for title, value in fields.items():
+                old = entry[title]
+                entry[title] = value
+
+                if title in self._columns and entry[title] != old:
+                    self._column_move(title, old, entry, i)
+
+            if titled:
+                self.spreadsheet.register_title(entry)
+
+            self._dirty.add(i)
+
+        self.spreadsheet.changed()
+        return entry
+
+    def positions_of(self, entries):
+        ''' Returns {cache position: entry} of entries found in cache, IDs are checked first
+
+        :raises IndexError: an entry has no ID
+        '''
+
+        for param in entries:
+            if not param.get('eimdbID') and not param.get('imdbID'):
+                raise IndexError(f'Error: Unable to get ID\n{param}')
+
+        positions = {}
+
+        for param in entries:
+            i = self.index_of(get_ID(param))
+
+            if i is not None:
+                positions[i] = self._cache[i]
+
+        return positions
 
+    def _append_many(self, entries):
+        start = len(self._cache)
+        self._cache.extend(entries)
+
+        for pos, entry in enumerate(entries, start):
+            self._index_add(pos, entry)
+            self._dirty.add(pos)
+
+    def _remove_many(self, positions):
+        first = min(positions)
+        removed = [self._cache[i] for i in sorted(positions)]
+        self._cache[first:] = [v for i, v in enumerate(self._cache[first:], first) if i not in positions]
+
+        for entry in removed:
+            self._index_remove(entry)
+
+        # One pass for every shifted entry instead of one per removal
+        self.reindex(start=first)
+
+        if self._shifted_from is None or first < self._shifted_from:
+            self._shifted_from = first
+
+        return removed
+
+    def add_many(self, entries, ignore=None):
+        ''' Appends entries as one batch: duplicates within the batch or already in
+        a worksheet (except ignored ones) are skipped, indexes are updated once
+
+        :param ignore: sheet_title or [sheet_titles] not checked for duplicates
+
+        :returns: added entries
+        :rtype: list
+        '''
+
+        new, seen, skipped = [], set(), []
+
+        for param in entries:
+            entry = Entry(param)
+            ID = get_ID(entry)
+
+            if ID in (None, 'N/A') or entry['Title'] in (None, 'N/A'):
+                raise IndexError(f"Error: Missing args - Title: {entry.get('Title')}, ID: {ID}\nData: {param}")
+
+            if ID in seen or self.spreadsheet.locate(ID, ignore=ignore or []):
+                skipped.append(entry['Title'])
+                continue
+
+            seen.add(ID)
+            new.append(entry)
+
+        if skipped:
+            print(f'Skipped {len(skipped)} entries already tracked: {skipped}')
+
+        if new:
+            with self.spreadsheet.lock:
+                self._append_many(new)
+
+            self.spreadsheet.changed(len(new))
+
+        return new
+
+    def remove_many(self, entries):
+        ''' Removes entries found in cache as one batch, indexes are updated once
+
+        :returns: removed entries in cache order
+        :rtype: list
+        '''
+
+        positions = self.positions_of(entries)
+
+        if not positions:
+            return []
+
+        with self.spreadsheet.lock:
+            removed = self._remove_many(positions)
+
+        self.spreadsheet.changed(len(removed))
+        return removed
+
+    def move_many(self, entries, newwk):
+        ''' Moves entries to worksheet newwk as a unit: nothing is moved if any entry
+        is missing here or already tracked in another worksheet
+
+        :returns: moved entries, None if the batch was refused
+        :rtype: list
+        '''
+
+        positions = self.positions_of(entries)
+        missing = len({get_ID(i) for i in entries}) - len(positions)
+
+        if missing:
+            print(f'Error: {missing} entries not found in "{self.title}"')
+            return
+
+        dupes = [v['Title'] for v in positions.values() if self.spreadsheet.locate(get_ID(v), ignore=[self.title])]
+
+        if dupes:
+            print(f'Error: Already tracked in another worksheet: {dupes}')
+            return
+
+        with self.spreadsheet.lock:
+            moved = self._remove_many(positions)
+            newwk._append_many(moved)
+
+        self.spreadsheet.changed(2 * len(moved))
+        return moved
+
+    @operation
     def remove(self, **k):
         ''' Remove entry from cache '''
 
@@ -433,7 +824,7 @@ class Worksheet:
             print("No entries to remove!")
             return
 
-        data = k.get(data) or self.find()
+        data = k.get('param') or self.find()
 
         if not data:
             print("Unable to find entry!")
@@ -441,17 +832,13 @@ class Worksheet:
                 
         if isinstance(data, list):
             if msdb_user_confirm(f"This will delete all episodes in the season\nAre you sure? Y/N: "):
-                data_copy = list(data)
-
-                for v in data:
-                    if self.cache_remove(param=v):
-                        data_copy.pop(0)
-
-                return not data_copy
+                data = [i for i in data if i]
+                return len(self.remove_many(data)) == len(data)
         else:
             if msdb_user_confirm(f"Removing: {data['Title']}\nAre you sure? Y/N: "):
                 return self.cache_remove(param=data)
 
+    @operation
     def update(self, **k):
         data = k.get('param') or self.find()
 
@@ -518,11 +905,7 @@ class Worksheet:
             if new_date:
                 print(f"Changing date of: {old_data['Title']}\nTo: {new_date}")
 
-                param = old_data.copy()
-                param['Date'] = new_date
-
-                if self.cache_remove(param=old_data):
-                    return self.cache_append(param=param)        
+                return self.cache_update(old_data, Date=new_date)
 
         print('Choose data to edit')
         print('\n'.join([f'{v}' for v in self.spreadsheet.row_titles if v not in immutable_titles]))
@@ -531,17 +914,16 @@ class Worksheet:
         if choice == 'date':
             if isinstance(data, list):
                 if msdb_user_confirm('This will affect all episodes in the season\nAre you sure? Y/N: '):
-                    data_copy = list(data)
+                    data = [i for i in data if i]
                     new_date = get_date()
 
-                    for v in data:
-                        if change_date(v, new_date):
-                            data_copy.pop(0)
-                        
-                    return not data_copy
+                    if not new_date:
+                        return
+
+                    return all([change_date(v, new_date) for v in data])
             else:
                 return change_date(data)
-        elif isinstance(data, dict):
+        elif not isinstance(data, list):
             if choice == 'type':
                 while True:
                     input_type = input('Enter type of entry (movie or series, c to cancel): ').lower()
@@ -551,24 +933,24 @@ class Worksheet:
 
                     if input_type != 'movie' and input_type != 'series':
                         print("Error: Invalid input")
+                        continue
 
-                    param = data.copy()
-                    param['Type'] = input_type
-
-                    if self.cache_remove(param=data):
-                        return self.cache_append(param=param)
+                    return self.cache_update(data, Type=input_type)
             else:
+                row_title = choice.capitalize()
+
+                if row_title not in self.spreadsheet.row_titles or row_title in immutable_titles:
+                    print("Error: Invalid input")
+                    return
+
                 new_input = input('Enter new data (c to cancel): ')
 
                 if new_input.lower() == 'c':
                     return True
 
-                param = data.copy()
-                param[choice.capitalize()] = new_input
-
-                if self.cache_remove(param=data):
-                    return self.cache_append(param=param)
+                return self.cache_update(data, **{row_title: new_input})
 
+    @operation
     def move(self, **k):
         data = k.get('param') or self.find()
 
@@ -581,14 +963,6 @@ class Worksheet:
         if not newwk:
             return
         
-        if isinstance(data, list):
-            data_copy = list(data)
+        data = [i for i in data if i] if isinstance(data, list) else [data]
 
-            for v in data:
-                if self.cache_remove(param=v) and newwk.cache_append(param=v, ignore=[self.title]):
-                    data_copy.pop(0)
-                
-            return not data_copy
-        else:
-            if self.cache_remove(param=data):
-                return newwk.cache_append(param=data, ignore=[self.title])
\ No newline at end of file
+        return bool(self.move_many(data, newwk))
\ No newline at end of file
@@ -0,0 +1,245 @@
+''' Offline benchmarks for MS_T against a fake gspread spreadsheet and a local fake omdb server
+
+Usage:
+    python -m benchmarks.bench [--sizes 1000 10000 ...] [--save-baseline] [--no-memory]
+
+Each size builds a synthetic library of that many rows spread over four worksheets and
+times load, reload, find, manual_find, get_dupes, cache_append, move, add, export and save. Results are
+compared to benchmarks/baseline.json, slower times or extra api calls are flagged.
+'''
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from unittest import mock
+import MS_T
+from MS_T.entry import ROW_TITLES
+from MS_T.backends import MAX_SHEET_ROWS, shard_title
+from MS_T.cache import configure_query_cache
+from MS_T.series import configure_series_store
+from MS_T.omdb import configure_client, QuotaCounter
+from tests.fake_gspread import FakeSpreadsheet, FakeClient
+from benchmarks import fake_omdb
+# Imported lazily by MS_T, loaded up front so the one-time import is not timed
+import gspread.utils
+import requests
+
+SIZES = [1000, 10000, 50000, 200000]
+SHEETS = ['Planned', 'Available', 'Watched', 'Canceled']
+baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Flag when slower than baseline by this factor (plus a small absolute allowance)
+TIME_TOLERANCE = 1.5
+TIME_ALLOWANCE = 0.005
+SHARD_ROWS = MAX_SHEET_ROWS - 1
+
+def library(size):
+    ''' Synthetic rows: every fifth a movie, the rest full series episodes '''
+
+    episodes_per_series = fake_omdb.SEASONS * fake_omdb.EPISODES
+    rows = []
+    n_movies = size // 5
+
+    for n in range(n_movies):
+        m = fake_omdb.movie(n)
+        rows.append([m['Title'], 'Monday, January 01, 2024', m['imdbID'], f"https://www.imdb.com/title/{m['imdbID']}/", 'movie', 'N/A', 'N/A', 'N/A', m['Genre']])
+
+    n = 0
+
+    while len(rows) < size:
+        s = fake_omdb.series(n)
+
+        for i in range(episodes_per_series):
+            if len(rows) >= size:
+                break
+
+            season, episode = i // fake_omdb.EPISODES + 1, i % fake_omdb.EPISODES + 1
+            ID = fake_omdb.episode_id(n, season, episode)
+            rows.append([f"'{s['Title']}': S{season}E{episode} - Episode {episode}", 'Monday, January 01, 2024', s['imdbID'], f'https://www.imdb.com/title/{ID}/', 'series', str(season), str(episode), ID, s['Genre']])
+
+        n += 1
+
+    # Contiguous blocks per worksheet so series stay together, spilling into continuation sheets like saves do
+    block = -(-len(rows) // len(SHEETS))
+    sheets = {}
+
+    for i, t in enumerate(SHEETS):
+        wk_rows = rows[i*block:(i+1)*block]
+
+        for n in range(max(1, -(-len(wk_rows) // SHARD_ROWS))):
+            sheets[shard_title(t, n)] = [list(ROW_TITLES), *wk_rows[n*SHARD_ROWS:(n+1)*SHARD_ROWS]]
+
+    return sheets, n_movies, n
+
+def operations(size, n_movies, n_series):
+    ''' [(name, fn(ctx))] run in order on one spreadsheet '''
+
+    rng = random.Random(size)
+    movie_ids = [fake_omdb.movie_id(rng.randrange(n_movies)) for _ in range(100)]
+    movie_titles = [f'Movie {rng.randrange(n_movies)}' for _ in range(10)]
+
+    def load(ctx):
+        ctx['ss'] = MS_T.Spreadsheet(client=FakeClient([ctx['fake']]), spreadsheet=ctx['fake'], API_KEY='bench', snapshot_path=None)
+        ctx['ss'].load()
+
+    def reload(ctx):
+        ctx['ss'].load()
+
+    def find(ctx):
+        for ID in movie_ids:
+            for wk in ctx['ss'].worksheets:
+                wk.find(param={'imdbID': ID})
+
+    def manual_find(ctx):
+        for title in movie_titles:
+            ctx['ss'].worksheets[0].manual_find(selected_type='Title', data_to_find=title)
+
+    def get_dupes(ctx):
+        for ID in movie_ids:
+            ctx['ss'].get_dupes(param={'Title': ID, 'imdbID': ID}, noprint=True)
+
+    def cache_append(ctx):
+        wk = ctx['ss'].worksheets[1]
+
+        for n in range(n_movies, n_movies + 1000):
+            wk.cache_append(param={'Title': f'Movie {n}', 'imdbID': fake_omdb.movie_id(n), 'Type': 'movie'})
+
+    def move(ctx):
+        # Last full series of the last worksheet to the first worksheet
+        wk = ctx['ss'].worksheets[-1]
+        ID = wk.cache[-1]['imdbID']
+        entries = [i for i in wk.cache if i['imdbID'] == ID]
+
+        with mock.patch('builtins.input', return_value=SHEETS[0]):
+            wk.move(param=entries)
+
+    def add(ctx):
+        ctx['ss'].worksheets[2].add(param=fake_omdb.series(n_series + 1), se=True)
+
+    def export(ctx):
+        MS_T.exporter.export_all(ctx['ss'], os.path.join(ctx['dir'], 'exports'), compress=True)
+
+    def save(ctx):
+        ctx['ss'].save()
+
+    return [
+        ('load', load),
+        ('reload unchanged', reload),
+        ('find x100', find),
+        ('manual_find x10', manual_find),
+        ('get_dupes x100', get_dupes),
+        ('cache_append x1000', cache_append),
+        ('move series', move),
+        ('add series', add),
+        ('export csv.gz', export),
+        ('save', save)
+    ]
+
+def run(size, memory=False):
+    sheets, n_movies, n_series = library(size)
+    ctx = {'fake': FakeSpreadsheet(sheets)}
+    results = {}
+
+    with tempfile.TemporaryDirectory() as d, fake_omdb.FakeOMDb() as omdb, open(os.devnull, 'w') as devnull:
+        ctx['dir'] = d
+        configure_query_cache(path=os.path.join(d, 'cache.sqlite3'))
+        configure_series_store(path=os.path.join(d, 'cache.sqlite3'))
+        configure_client(url=omdb.url, rate=10**6, capacity=10**6, quota=QuotaCounter(path=os.path.join(d, 'quota.sqlite3'), daily_limit=10**9))
+
+        for name, fn in operations(size, n_movies, n_series):
+            sheet_calls, omdb_calls = sum(ctx['fake'].calls[k] for k in ctx['fake'].calls if not k.startswith('cells')), omdb.calls['omdb']
+
+            if memory:
+                tracemalloc.start()
+
+            start = time.perf_counter()
+
+            with contextlib.redirect_stdout(devnull):
+                fn(ctx)
+
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                'time': elapsed,
+                'sheets_calls': sum(ctx['fake'].calls[k] for k in ctx['fake'].calls if not k.startswith('cells')) - sheet_calls,
+                'omdb_calls': omdb.calls['omdb'] - omdb_calls
+            }
+
+            if memory:
+                results[name]['peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+
+    return results
+
+def compare(results, baseline):
+    ''' Returns [(size, op, reason)] regressions against baseline '''
+
+    regressions = []
+
+    for size, ops in results.items():
+        for op, r in ops.items():
+            b = baseline.get(size, {}).get(op)
+
+            if not b:
+                continue
+
+            if r['time'] > b['time'] * TIME_TOLERANCE + TIME_ALLOWANCE:
+                regressions.append((size, op, f"time {r['time']:.4f}s vs {b['time']:.4f}s"))
+
+            for k in ('sheets_calls', 'omdb_calls'):
+                if r[k] > b[k]:
+                    regressions.append((size, op, f"{k} {r[k]} vs {b[k]}"))
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline MS_T benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--baseline', default=baseline_path)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    for size in args.sizes:
+        results[str(size)] = run(size)
+
+        # Memory is measured on a separate pass so tracing does not skew timings
+        if not args.no_memory:
+            for op, r in run(size, memory=True).items():
+                results[str(size)][op]['peak_kb'] = r['peak_kb']
+
+        print(f'\nRows: {size}')
+        print(f"{'Operation':<22}{'Time (s)':>12}{'Sheets calls':>14}{'OMDb calls':>12}{'Peak (KB)':>12}")
+
+        for op, r in results[str(size)].items():
+            print(f"{op:<22}{r['time']:>12.4f}{r['sheets_calls']:>14}{r['omdb_calls']:>12}{r.get('peak_kb', '-'):>12}")
+
+    baseline = {}
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    regressions = compare(results, baseline)
+
+    for size, op, reason in regressions:
+        print(f'REGRESSION - {size} rows, {op}: {reason}')
+
+    if args.save_baseline:
+        baseline.update(results)
+
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2)
+
+        print(f'\nBaseline saved: {args.baseline}')
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
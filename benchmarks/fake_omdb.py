@@ -0,0 +1,96 @@
+''' Local stand-in for the omdb api serving a synthetic library
+
+IDs encode what they are:
+    tt7NNNNNN - movie N
+    tt8NNNNNN - series N (SEASONS seasons of EPISODES episodes)
+    tt9NNNNNSSEE - episode E of season S of series N
+'''
+
+import json
+import threading
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEASONS = 5
+EPISODES = 10
+not_found = {'Response': 'False', 'Error': 'Incorrect IMDb ID.'}
+
+def movie_id(n):
+    return f'tt7{n:06d}'
+
+def series_id(n):
+    return f'tt8{n:06d}'
+
+def episode_id(n, season, episode):
+    return f'tt9{n:05d}{season:02d}{episode:02d}'
+
+def movie(n):
+    return {'Title': f'Movie {n}', 'Year': '2001', 'imdbID': movie_id(n), 'Type': 'movie', 'Genre': 'Drama', 'Response': 'True'}
+
+def series(n):
+    return {'Title': f'Series {n}', 'Year': '2010–2015', 'imdbID': series_id(n), 'Type': 'series', 'Genre': 'Comedy', 'totalSeasons': str(SEASONS), 'Response': 'True'}
+
+def season(n, s):
+    return {
+        'Title': f'Series {n}',
+        'Season': str(s),
+        'totalSeasons': str(SEASONS),
+        'Episodes': [
+            {'Title': f'Episode {e}', 'Released': '2010-01-01', 'Episode': str(e), 'imdbRating': '8.0', 'imdbID': episode_id(n, s, e)}
+            for e in range(1, EPISODES+1)
+        ],
+        'Response': 'True'
+    }
+
+def respond(params):
+    ID = params.get('i', '')
+    title = params.get('t', '')
+
+    if title.startswith('Movie '):
+        return movie(int(title[6:]))
+    elif title.startswith('Series '):
+        return series(int(title[7:]))
+    elif ID.startswith('tt7'):
+        return movie(int(ID[3:]))
+    elif ID.startswith('tt8'):
+        n = int(ID[3:])
+        return season(n, int(params['Season'])) if params.get('Season') else series(n)
+
+    return not_found
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self.server.calls['omdb'] += 1
+
+        body = json.dumps(respond(params)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FakeOMDb:
+    def __init__(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.server.calls = Counter()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    @property
+    def calls(self):
+        return self.server.calls
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
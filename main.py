@@ -14,7 +14,17 @@ if API_KEY is None:
     if API_KEY is None:
         raise ValueError('Unable to find APIKEY')
 
-spreadsheet = MS_T.Spreadsheet(API_KEY=API_KEY)
+# STORAGE=sqlite keeps data in a local database (MIRROR=1 copies writes to google sheets)
+if os.getenv('STORAGE', '').lower() == 'sqlite':
+    mirror = MS_T.GSheetsBackend() if os.getenv('MIRROR') else None
+    spreadsheet = MS_T.Spreadsheet(API_KEY=API_KEY, backend=MS_T.SQLiteBackend(mirror=mirror))
+else:
+    spreadsheet = MS_T.Spreadsheet(API_KEY=API_KEY)
+
+# AUTOSAVE=<seconds> saves changes from a background thread (and at exit), 'save' waits for it
+if os.getenv('AUTOSAVE'):
+    spreadsheet.enable_autosave(interval=float(os.getenv('AUTOSAVE')))
+
 MENU_OPTIONS = {
     ('help', '?'): {
         'desc': 'Show commands'
@@ -59,6 +69,10 @@ MENU_OPTIONS = {
         'desc': 'Find entry without querying',
         'func': lambda **k: print(k['execute_on_worksheet']('manual_find'))
     },
+    ('mfa'): {
+        'desc': 'Find entry in all worksheets without querying',
+        'func': lambda **k: spreadsheet.manual_find()
+    },
     ('a', 'add'): {        
         'desc': 'Add entry',
         'func': lambda **k: k['execute_on_worksheet']('add')
@@ -87,6 +101,14 @@ MENU_OPTIONS = {
         'desc': 'Send cache to database',
         'func': lambda **k: spreadsheet.save()
     },
+    ('stats'): {
+        'desc': 'Show timing and counts of spreadsheet/omdb calls',
+        'func': lambda **k: print(MS_T.stats.get_stats().report())
+    },
+    ('sj', 'stats json'): {
+        'desc': 'Dump call stats to stats.json',
+        'func': lambda **k: print(f'Stats saved: {MS_T.stats.get_stats().dump()}')
+    },
     ('av', 'all values'): {
         'desc': 'Get all values in the spreadsheet',
         'func': lambda **k: print(spreadsheet.all_values)
@@ -0,0 +1,155 @@
+''' In-process stand-ins for the gspread objects used by MS_T (no network)
+
+Every method that would be an API request is counted in FakeSpreadsheet.calls,
+along with cells read and written
+'''
+
+from collections import Counter
+
+class FakeWorksheet:
+    def __init__(self, title, values=None, spreadsheet=None) -> None:
+        self.title = title
+        self.spreadsheet = spreadsheet
+        self.rows = [list(r) for r in values or []]
+
+    def count(self, name, read=0, written=0):
+        if self.spreadsheet:
+            self.spreadsheet.count(name, read, written)
+
+    def get_all_values(self):
+        self.count('get_all_values', read=sum(map(len, self.rows)))
+        return [list(r) for r in self.rows]
+
+    def col_values(self, col):
+        self.count('col_values', read=len(self.rows))
+        return [r[col-1] if len(r) >= col else '' for r in self.rows]
+
+    def batch_clear(self, ranges):
+        self.count('batch_clear')
+
+        for r in ranges:
+            start, end = _parse_range(r)
+
+            for row in range(start, min(end, len(self.rows))):
+                self.rows[row] = []
+
+    def format(self, ranges, format):
+        self.count('format')
+
+    def freeze(self, rows=None, cols=None):
+        self.count('freeze')
+
+    def update(self, range_name, values):
+        self.count('update', written=sum(map(len, values)))
+        self._write(_parse_range(range_name)[0], values)
+
+    def batch_update(self, data):
+        self.count('batch_update', written=sum(len(r) for d in data for r in d['values']))
+
+        for d in data:
+            self._write(_parse_range(d['range'])[0], d['values'])
+
+    def _write(self, start, values):
+        if self.spreadsheet:
+            self.spreadsheet.revision += 1
+
+        while len(self.rows) < start + len(values):
+            self.rows.append([])
+
+        for i, v in enumerate(values):
+            self.rows[start+i] = list(v)
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets=None) -> None:
+        self.id = 'fake'
+        self.title = 'Fake'
+        self.url = 'https://example.invalid/fake'
+        self.revision = 0
+        self.calls = Counter()
+        self.sheets = [FakeWorksheet(t, v, self) for t, v in (sheets or {}).items()]
+
+    def count(self, name, read=0, written=0):
+        self.calls[name] += 1
+        self.calls['cells_read'] += read
+        self.calls['cells_written'] += written
+
+    def find(self, title):
+        for i in self.sheets:
+            if i.title == title:
+                return i
+
+    def get_lastUpdateTime(self):
+        self.count('get_lastUpdateTime')
+        return f'revision-{self.revision}'
+
+    def worksheets(self):
+        self.count('worksheets')
+        return list(self.sheets)
+
+    def worksheet(self, title):
+        self.count('worksheet')
+        return self.find(title)
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self.count('add_worksheet')
+        self.sheets.append(FakeWorksheet(title, spreadsheet=self))
+        return self.sheets[-1]
+
+    def values_batch_get(self, ranges, params=None):
+        value_ranges = []
+
+        for r in ranges:
+            values = [_trim(row) for row in self.find(_sheet_name(r)).rows]
+
+            while values and not values[-1]:
+                values.pop()
+
+            value_ranges.append({'range': r, 'values': values})
+
+        self.count('values_batch_get', read=sum(len(row) for v in value_ranges for row in v['values']))
+        return {'valueRanges': value_ranges}
+
+    def values_batch_update(self, body=None):
+        self.count('values_batch_update', written=sum(len(r) for d in body['data'] for r in d['values']))
+
+        for d in body['data']:
+            self.find(_sheet_name(d['range']))._write(_parse_range(d['range'])[0], d['values'])
+
+    def values_batch_clear(self, params=None, body=None):
+        self.count('values_batch_clear')
+
+        for r in body['ranges']:
+            sheet = self.find(_sheet_name(r))
+            start = _parse_range(r)[0]
+            sheet._write(start, [[] for _ in sheet.rows[start:]])
+
+
+class FakeClient:
+    def __init__(self, spreadsheets=None) -> None:
+        self.spreadsheets = {i.id: i for i in spreadsheets or []}
+
+    def open_by_key(self, key):
+        return self.spreadsheets[key]
+
+
+def _trim(row):
+    row = list(row)
+
+    while row and row[-1] == '':
+        row.pop()
+
+    return row
+
+def _sheet_name(a1):
+    return a1.rpartition('!')[0].strip("'").replace("''", "'") if '!' in a1 else a1.strip("'").replace("''", "'")
+
+def _parse_range(a1):
+    ''' 'A2:Z10' -> (1, 10) zero-based row span '''
+
+    a1 = a1.split('!')[-1]
+    start, _, end = a1.partition(':')
+    start = int(''.join(c for c in start if c.isdigit()) or 1)
+    end = int(''.join(c for c in end if c.isdigit()) or start) if end else start
+
+    return start-1, end
@@ -0,0 +1,202 @@
+import os
+import tempfile
+import time
+import threading
+import unittest
+from unittest import mock
+import MS_T
+from MS_T.cache import QueryCache
+from MS_T.series import SeriesStore, is_finished
+
+series = {'Title': 'Loki', 'Year': '2021–', 'imdbID': 'tt9140554', 'Type': 'series', 'totalSeasons': '2', 'Response': 'True'}
+movie = {'Title': 'Barbie', 'Year': '2023', 'imdbID': 'tt1517268', 'Type': 'movie', 'Response': 'True'}
+missing = {'Response': 'False', 'Error': 'Movie not found!'}
+
+class test_query_cache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache = QueryCache(path=os.path.join(self.dir.name, 'cache.sqlite3'), max_entries=2)
+
+    def tearDown(self):
+        self.cache.db.close()
+        self.dir.cleanup()
+
+    def test_key_ignores_apikey_and_case(self):
+        self.assertEqual(
+            QueryCache.key({'i': 'TT1517268', 'apikey': 'a'}),
+            QueryCache.key({'i': 'tt1517268', 'Season': None, 'apikey': 'b'})
+        )
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.ttl({'i': 'tt9140554'}, series), self.cache.ongoing_ttl)
+        self.assertEqual(self.cache.ttl({'i': 'tt1517268'}, movie), self.cache.finished_ttl)
+        self.assertEqual(self.cache.ttl({'t': 'nope'}, missing), self.cache.missing_ttl)
+        self.assertEqual(self.cache.ttl({'i': 'tt9140554', 'Season': 2}, {'Season': '2', 'totalSeasons': '2', 'Response': 'True'}), self.cache.ongoing_ttl)
+
+    def test_expired(self):
+        self.cache.missing_ttl = -1
+        self.cache.set({'t': 'nope'}, missing)
+
+        self.assertIsNone(self.cache.get({'t': 'nope'}))
+
+    def test_lru_eviction(self):
+        self.cache.set({'i': 'a'}, movie)
+        self.cache.set({'i': 'b'}, movie)
+
+        with mock.patch('MS_T.cache.time.time', return_value=time.time() + 10):
+            self.cache.get({'i': 'a'})
+            self.cache.set({'i': 'c'}, movie)
+
+        self.assertTrue(self.cache.get({'i': 'a'}))
+        self.assertIsNone(self.cache.get({'i': 'b'}))
+
+    def test_query_uses_cache(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = missing
+
+        with mock.patch('MS_T.utils.get_query_cache', return_value=self.cache), mock.patch('MS_T.utils.get_client') as client:
+            get = client.return_value.get_sync
+            get.return_value = response
+
+            self.assertIsNone(MS_T.utils.query({'t': 'nope', 'apikey': 'x'}))
+            self.assertIsNone(MS_T.utils.query({'t': 'nope', 'apikey': 'y'}))
+            self.assertEqual(get.call_count, 1)
+
+            # Bypassing neither reads nor writes the cache, refreshing only skips the read
+            response.json.return_value = movie
+            self.assertEqual(MS_T.utils.query({'i': 'tt1517268', 'apikey': 'x'}, use_cache=False), movie)
+            self.assertIsNone(self.cache.get({'i': 'tt1517268'}))
+
+            MS_T.utils.query({'t': 'nope', 'apikey': 'x'}, refresh=True)
+            self.assertEqual(get.call_count, 3)
+            self.assertEqual(self.cache.get({'t': 'nope'}), movie)
+
+class test_singleflight(unittest.TestCase):
+    def test_concurrent_identical_queries(self):
+        calls = []
+
+        def fetch(params, use_cache=True, refresh=False):
+            calls.append(params)
+            time.sleep(0.1)
+            return {'Response': 'True', 'Episodes': []}
+
+        results = []
+
+        with mock.patch('MS_T.utils.fetch', side_effect=fetch):
+            threads = [threading.Thread(target=lambda: results.append(MS_T.utils.query({'i': 'tt9140554', 'Season': 1, 'apikey': 'x'}))) for _ in range(4)]
+
+            for t in threads:
+                t.start()
+
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        # Callers get their own copies
+        self.assertEqual(len({id(r) for r in results}), 4)
+
+class test_query_seasons(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache = QueryCache(path=os.path.join(self.dir.name, 'cache.sqlite3'))
+
+    def tearDown(self):
+        self.cache.db.close()
+        self.dir.cleanup()
+
+    def test_order_bound_and_failures(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def query(params):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+
+            # Later seasons answer first
+            time.sleep(0.01 * (7 - params['Season']))
+
+            with lock:
+                state['running'] -= 1
+
+            return None if params['Season'] == 3 else {'Season': str(params['Season']), 'Response': 'True'}
+
+        with mock.patch('MS_T.utils.get_query_cache', return_value=self.cache), mock.patch('MS_T.utils.get_client'), \
+                mock.patch('MS_T.utils.query', side_effect=query), mock.patch('builtins.print') as printed:
+            fetched = MS_T.utils.query_seasons('tt9140554', 6, title='Loki', API_KEY='x', max_parallel=2)
+
+        self.assertEqual([n for n, _ in fetched], [1, 2, 4, 5, 6])
+        self.assertEqual([v['Season'] for _, v in fetched], ['1', '2', '4', '5', '6'])
+        self.assertEqual(state['peak'], 2)
+        printed.assert_called_once_with('Failed to get data from season 3 of Loki')
+
+def season(n, episodes=3, total=2):
+    return {'Season': str(n), 'totalSeasons': str(total), 'Response': 'True', 'Episodes': [
+        {'Title': f'Episode {e}', 'Episode': str(e), 'imdbID': f'tt{n}00{e}'} for e in range(1, episodes+1)
+    ]}
+
+class test_series_store(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = SeriesStore(path=os.path.join(self.dir.name, 'cache.sqlite3'))
+
+    def tearDown(self):
+        self.store.db.close()
+        self.dir.cleanup()
+
+    def query_seasons(self, imdbID, total_seasons, seasons=None, **k):
+        return [(n, season(n)) for n in seasons]
+
+    def test_is_finished(self):
+        self.assertTrue(is_finished('2008–2013'))
+        self.assertTrue(is_finished('1999'))
+        self.assertFalse(is_finished('2021–'))
+        self.assertFalse(is_finished('N/A'))
+
+    def test_finished_series_fetched_once(self):
+        finished = dict(series, Year='2021–2023')
+
+        with mock.patch('MS_T.series.query') as query, mock.patch('MS_T.series.query_seasons', side_effect=self.query_seasons) as query_seasons:
+            first = self.store.seasons(series['imdbID'], ms=finished)
+            second = self.store.seasons(series['imdbID'], API_KEY='x')
+
+            with mock.patch('MS_T.series.time.time', return_value=time.time() + 365 * 24 * 60 * 60):
+                self.store.seasons(series['imdbID'])
+
+        self.assertEqual(first, second)
+        self.assertEqual([n for n, _ in first], [1, 2])
+        self.assertEqual(query_seasons.call_count, 1)
+        query.assert_not_called()
+
+    def test_missing_season_only(self):
+        with mock.patch('MS_T.series.query'), mock.patch('MS_T.series.query_seasons', side_effect=self.query_seasons) as query_seasons:
+            self.store.seasons(series['imdbID'], seasons=[1], ms=series)
+            episodes = self.store.episodes(series['imdbID'], episode=2)
+
+        self.assertEqual(query_seasons.call_args_list[1].kwargs['seasons'], [2])
+        self.assertEqual([(n, i['imdbID']) for n, i in episodes], [(1, 'tt1002'), (2, 'tt2002')])
+
+    def test_ongoing_refreshes_latest_season(self):
+        with mock.patch('MS_T.series.query_seasons', side_effect=self.query_seasons):
+            self.store.seasons(series['imdbID'], ms=series)
+
+        self.store.ongoing_ttl = -1
+
+        # Season 2 gained an episode and season 3 was announced
+        with mock.patch('MS_T.series.query', return_value=season(2, episodes=4, total=3)) as query, mock.patch('MS_T.series.query_seasons', side_effect=self.query_seasons) as query_seasons:
+            seasons = dict(self.store.seasons(series['imdbID']))
+
+        query.assert_called_once_with({'i': series['imdbID'], 'Season': 2, 'apikey': None}, refresh=True)
+        self.assertEqual(query_seasons.call_args.kwargs['seasons'], [3])
+        self.assertEqual(len(seasons[2]), 4)
+        self.assertEqual(list(seasons), [1, 2, 3])
+
+    def test_series_of(self):
+        self.store.set_season(series['imdbID'], 1, season(1)['Episodes'])
+
+        self.assertEqual(self.store.series_of('tt1003'), {'imdbID': series['imdbID'], 'Season': '1', 'Episode': '3'})
+        self.assertIsNone(self.store.series_of('tt9999'))
+
+if __name__ == '__main__':
+    unittest.main()
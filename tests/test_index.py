@@ -0,0 +1,304 @@
+import unittest
+from unittest import mock
+import MS_T
+from MS_T.title_index import TitleIndex
+from tests.fake_gspread import FakeSpreadsheet
+
+ROW_TITLES = ['Title', 'Date', 'imdbID', 'Link', 'Type', 'Season', 'Episode', 'eimdbID', 'Genre']
+
+def episode(n, series='tt0903747'):
+    return {
+        'Title': f"'Breaking Bad': S1E{n}",
+        'imdbID': series,
+        'Type': 'series',
+        'Season': '1',
+        'Episode': str(n),
+        'eimdbID': f'tt90{n:05d}'
+    }
+
+def new_spreadsheet():
+    fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+    return MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+
+class test_index(unittest.TestCase):
+    def setUp(self):
+        self.ss = new_spreadsheet()
+        self.wk = self.ss.worksheet('Planned')
+
+        self.wk.cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+
+        for n in range(1, 6):
+            self.wk.cache_append(param=episode(n))
+
+    def test_find_by_ID(self):
+        self.assertEqual(self.wk.find(param={'imdbID': 'tt1517268'})['Title'], 'Barbie')
+        self.assertEqual(self.wk.find(param=episode(3), index=True), 3)
+
+    def test_find_series_returns_first_episode(self):
+        self.assertEqual(self.wk.find(param={'imdbID': 'tt0903747'}, index=True), 1)
+
+        self.wk.cache_remove(param=episode(1))
+
+        self.assertEqual(self.wk.find(param={'imdbID': 'tt0903747'})['eimdbID'], episode(2)['eimdbID'])
+
+    def test_remove_keeps_positions(self):
+        self.wk.cache_remove(param={'imdbID': 'tt1517268'})
+
+        self.assertIsNone(self.wk.find(param={'imdbID': 'tt1517268'}))
+
+        for n in range(1, 6):
+            i = self.wk.find(param=episode(n), index=True)
+            self.assertEqual(self.wk.cache[i]['eimdbID'], episode(n)['eimdbID'])
+
+    def test_cache_reassign_rebuilds_index(self):
+        self.wk.cache = []
+
+        self.assertIsNone(self.wk.find(param=episode(1)))
+
+    def test_manual_find_all_matches(self):
+        find = lambda v: [i['eimdbID'] for i in self.wk.manual_find(selected_type='Type', data_to_find=v)]
+
+        self.assertEqual(find('series'), [episode(n)['eimdbID'] for n in range(1, 6)])
+
+        # Built once, then kept up to date
+        self.wk.cache_remove(param=episode(2))
+        self.wk.cache_append(param=episode(6))
+
+        self.assertEqual(find('series'), [episode(n)['eimdbID'] for n in (1, 3, 4, 5, 6)])
+        self.assertEqual(self.wk.manual_find(selected_type='Genre', data_to_find='N/A')[0]['Title'], 'Barbie')
+        self.assertEqual(find('movie'), ['N/A'])
+
+        self.wk.cache_remove(param={'imdbID': 'tt1517268'})
+        self.assertEqual(find('movie'), [])
+
+    def test_manual_find_all_worksheets(self):
+        self.ss.worksheet('Watched').cache_append(param={'Title': 'Dune', 'imdbID': 'tt1160419', 'Type': 'movie'})
+
+        found = self.wk.manual_find(selected_type='Type', data_to_find='movie', all_worksheets=True, noprint=True)
+
+        self.assertEqual([i['Title'] for i in found], ['Barbie', 'Dune'])
+
+class test_entry(unittest.TestCase):
+    def test_dict_access(self):
+        entry = MS_T.Entry(episode(1))
+
+        self.assertEqual(entry['Genre'], 'N/A')
+        self.assertEqual(entry, {**{t: 'N/A' for t in ROW_TITLES}, **episode(1)})
+        self.assertIsNone(entry.Genre)
+        self.assertIs(entry['imdbID'], MS_T.Entry(episode(2))['imdbID'])
+        self.assertRaises(KeyError, entry.__getitem__, 'Episodes')
+
+    def test_row_roundtrip(self):
+        entry = MS_T.Entry(episode(1))
+
+        self.assertEqual(MS_T.Entry.from_row(entry.row()), entry)
+
+class test_registry(unittest.TestCase):
+    def setUp(self):
+        self.ss = new_spreadsheet()
+        self.planned = self.ss.worksheet('Planned')
+        self.watched = self.ss.worksheet('Watched')
+
+        for n in range(1, 4):
+            self.planned.cache_append(param=episode(n))
+
+        self.watched.cache_append(param=episode(4))
+
+    def test_dedupe_across_worksheets(self):
+        self.assertIsNone(self.watched.cache_append(param=episode(2)))
+        self.assertEqual(len(self.watched.cache), 1)
+
+    def test_locate_series(self):
+        sheets = [wk.title for wk, _ in self.ss.locate('tt0903747')]
+
+        self.assertCountEqual(sheets, ['Planned', 'Watched'])
+        self.assertEqual(self.ss.locate('tt0903747', ignore=['Planned'])[0][0].title, 'Watched')
+
+    def test_get_dupes_ignore(self):
+        self.assertEqual(len(self.ss.get_dupes(param=episode(1), noprint=True)), 1)
+        self.assertFalse(self.ss.get_dupes(param=episode(1), ignore=['Planned'], noprint=True))
+
+    def test_registry_follows_remove(self):
+        self.watched.cache_remove(param=episode(4))
+
+        self.assertNotIn(episode(4)['eimdbID'], self.ss.registry)
+        self.assertEqual([wk.title for wk, _ in self.ss.locate('tt0903747')], ['Planned'])
+
+class test_batch(unittest.TestCase):
+    def setUp(self):
+        self.ss = new_spreadsheet()
+        self.planned = self.ss.worksheet('Planned')
+        self.watched = self.ss.worksheet('Watched')
+
+        self.planned.cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        self.planned.add_many([episode(n) for n in range(1, 6)])
+
+    def assertIndexed(self, wk):
+        # Incremental updates match a full rebuild
+        index, series = dict(wk._index), {k: list(v) for k, v in wk._series.items()}
+        wk.reindex()
+
+        self.assertEqual((index, series), (wk._index, {k: list(v) for k, v in wk._series.items()}))
+
+    def test_add_many_dedupes(self):
+        added = self.watched.add_many([episode(5), episode(6), episode(6), episode(7)])
+
+        self.assertEqual([i['eimdbID'] for i in added], [episode(6)['eimdbID'], episode(7)['eimdbID']])
+        self.assertEqual(self.ss.locate(episode(6)['eimdbID'])[0][0].title, 'Watched')
+        self.assertIndexed(self.watched)
+
+        self.assertRaises(IndexError, self.watched.add_many, [{'Title': 'No ID'}])
+
+    def test_remove_many(self):
+        removed = self.planned.remove_many([episode(2), episode(4), episode(9)])
+
+        self.assertEqual([i['eimdbID'] for i in removed], [episode(2)['eimdbID'], episode(4)['eimdbID']])
+        self.assertEqual([i['Title'] for i in self.planned.cache], ['Barbie', *(episode(n)['Title'] for n in (1, 3, 5))])
+        self.assertEqual(self.planned.find(param=episode(5), index=True), 3)
+        self.assertIndexed(self.planned)
+
+    def test_move_many(self):
+        moved = self.planned.move_many(self.planned.series_entries('tt0903747'), self.watched)
+
+        self.assertEqual(len(moved), 5)
+        self.assertEqual([i['Title'] for i in self.planned.cache], ['Barbie'])
+        self.assertEqual([wk.title for wk, _ in self.ss.locate('tt0903747')], ['Watched'])
+        self.assertIndexed(self.planned)
+        self.assertIndexed(self.watched)
+
+    def test_move_many_is_a_unit(self):
+        self.ss.worksheet('Watched').cache_append(param=episode(6))
+        self.planned._cache.append(MS_T.Entry(episode(6)))
+        self.planned.reindex()
+
+        self.assertIsNone(self.planned.move_many([episode(1), episode(6)], self.watched))
+        self.assertIsNone(self.planned.move_many([episode(1), episode(8)], self.watched))
+        self.assertEqual(len(self.planned.cache), 7)
+        self.assertEqual(len(self.watched.cache), 1)
+
+    def test_remove_and_move_commands(self):
+        with mock.patch('MS_T.worksheet.msdb_user_confirm', return_value=True):
+            self.assertTrue(self.planned.remove(param=self.planned.find(param=episode(1))))
+            self.assertTrue(self.planned.remove(param=self.planned.series_entries('tt0903747', season=1)[:2]))
+
+        self.assertEqual([i['Title'] for i in self.planned.cache], ['Barbie', *(episode(n)['Title'] for n in (4, 5))])
+
+        with mock.patch.object(self.ss, 'get_worksheet_by_title', return_value=self.watched):
+            self.assertTrue(self.planned.move(param=self.planned.find(param={'imdbID': 'tt1517268'})))
+            self.assertTrue(self.planned.move(param=self.planned.series_entries('tt0903747')))
+
+        self.assertEqual([i['Title'] for i in self.watched.cache], ['Barbie', *(episode(n)['Title'] for n in (4, 5))])
+        self.assertEqual(self.planned.cache, [])
+        self.assertIndexed(self.planned)
+        self.assertIndexed(self.watched)
+
+    def test_season_save(self):
+        self.ss.save()
+        self.planned.remove_many([episode(1), episode(2)])
+        self.ss.save()
+
+        self.assertEqual([r[0] for r in self.ss.g.worksheet('Planned').rows[1:]], ['Barbie', *(episode(n)['Title'] for n in range(3, 6)), '', ''])
+
+class test_cache_update(unittest.TestCase):
+    def setUp(self):
+        self.ss = new_spreadsheet()
+        self.wk = self.ss.worksheet('Planned')
+
+        self.wk.cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        self.wk.add_many([episode(n) for n in range(1, 6)])
+        self.ss.save()
+
+    def test_in_place(self):
+        entry = self.wk.cache_update(episode(2), Date='Monday, January 01, 2024')
+
+        self.assertIs(self.wk.cache[2], entry)
+        self.assertEqual(entry['Date'], 'Monday, January 01, 2024')
+        self.assertEqual(self.wk.find(param=episode(2), index=True), 2)
+        self.assertEqual(self.wk.pending_changes()['spans'], [(2, [entry.row()])])
+
+        self.assertIsNone(self.wk.cache_update(episode(9), Date='Monday, January 01, 2024'))
+        self.assertRaises(IndexError, self.wk.cache_update, episode(1), eimdbID='tt1')
+
+    def test_column_index_keeps_cache_order(self):
+        find = lambda v: [i['Title'] for i in self.wk.manual_find(selected_type='Date', data_to_find=v)]
+        self.assertEqual(len(find('N/A')), 6)
+
+        for n in (4, 2):
+            self.wk.cache_update(episode(n), Date='Monday, January 01, 2024')
+
+        self.assertEqual(find('Monday, January 01, 2024'), [episode(2)['Title'], episode(4)['Title']])
+        self.assertEqual(find('N/A'), ['Barbie', *(episode(n)['Title'] for n in (1, 3, 5))])
+
+    def test_title_index(self):
+        self.assertEqual(self.ss.title_index.best('Barbie')['imdbID'], 'tt1517268')
+
+        self.wk.cache_update({'imdbID': 'tt1517268'}, Title='Oppenheimer')
+
+        self.assertIsNone(self.ss.title_index.best('Barbie'))
+        self.assertEqual(self.ss.title_index.best('Oppenheimer')['imdbID'], 'tt1517268')
+
+class test_title_index(unittest.TestCase):
+    def setUp(self):
+        self.ss = new_spreadsheet()
+        self.wk = self.ss.worksheet('Planned')
+
+        for n in range(1, 4):
+            self.wk.cache_append(param=episode(n))
+
+        for title, ID in [('Barbie', 'tt1517268'), ('Dune', 'tt1160419'), ('Dune', 'tt0087182')]:
+            self.ss.worksheet('Watched').cache_append(param={'Title': title, 'imdbID': ID, 'Type': 'movie'})
+
+    def test_ranked_matches(self):
+        index = TitleIndex()
+        index.add(MS_T.Entry({'Title': 'The Lord of the Rings', 'imdbID': 'tt0120737'}))
+        index.add(MS_T.Entry({'Title': 'The Lord of War', 'imdbID': 'tt0399295'}))
+
+        self.assertEqual([doc['imdbID'] for _, doc in index.search('lord of the rings')], ['tt0120737', 'tt0399295'])
+        self.assertEqual(index.best('Lord of the Rings')['imdbID'], 'tt0120737')
+        self.assertIsNone(index.best('Lord'))
+
+        index.add(MS_T.Entry({'Title': 'Toy Story', 'imdbID': 'tt0114709'}))
+        self.assertIsNone(index.best('Toy Story 2'))
+
+    def test_episodes_match_series(self):
+        self.assertEqual(self.ss.title_index.best('breaking bad')['imdbID'], 'tt0903747')
+
+        for n in range(1, 4):
+            self.wk.cache_remove(param=episode(n))
+
+        self.assertIsNone(self.ss.title_index.best('breaking bad'))
+
+    def test_find_skips_omdb(self):
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['Barbi']):
+            self.assertEqual(self.ss.worksheet('Watched').find()['imdbID'], 'tt1517268')
+
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['Breaking Bad', '1', '2']):
+            self.assertEqual(self.wk.find()['eimdbID'], episode(2)['eimdbID'])
+
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['Breaking Bad', 'a*']):
+            self.assertEqual(len(self.ss.get_dupes(noprint=True)), 3)
+
+        # Untracked episode of a tracked series
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['Breaking Bad', '5', '2']):
+            self.assertEqual(self.ss.get_dupes(noprint=True), [])
+
+    def test_int_seasons(self):
+        # Worksheet.add builds episodes with int season numbers
+        self.wk.add_many([dict(episode(n, series='tt0460649'), Title=f"'How I Met Your Mother': S1E{n}", Season=1, Episode=n, eimdbID=f'tt80{n:05d}') for n in range(1, 4)])
+
+        self.assertEqual(len(self.wk.series_entries('tt0460649', season=1)), 3)
+
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['How I Met Your Mother', '1', '2']):
+            self.assertEqual(self.wk.find()['eimdbID'], 'tt8000002')
+
+        with mock.patch('MS_T.spreadsheet.sqGet', side_effect=AssertionError), mock.patch('builtins.input', side_effect=['How I Met Your Mother', 'e*']):
+            self.assertEqual(len(self.wk.find()), 3)
+
+    def test_ambiguous_title_asks_omdb(self):
+        with mock.patch('MS_T.spreadsheet.sqGet', return_value=None) as sqGet, mock.patch('builtins.input', side_effect=['Dune']):
+            self.assertIsNone(self.ss.worksheet('Watched').find())
+
+        sqGet.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
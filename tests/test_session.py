@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from MS_T.session import OMDbSession
+from MS_T.omdb import TokenBucket, QuotaCounter, QuotaExceeded, AsyncOMDbClient
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    failures = 0
+
+    def do_GET(self):
+        status = 200
+
+        if Handler.failures:
+            Handler.failures -= 1
+            status = 503
+
+        body = json.dumps({'Response': 'True'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class test_session(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_keep_alive(self):
+        session = OMDbSession(backoff=0)
+
+        for _ in range(5):
+            self.assertEqual(session.get(self.url, {'i': 'tt1'}).status_code, 200)
+
+        self.assertEqual(session.stats['new_connections'], 1)
+        self.assertEqual(session.stats['reused_connections'], 4)
+        session.close()
+
+    def test_retry(self):
+        session = OMDbSession(retries=2, backoff=0)
+        Handler.failures = 2
+
+        self.assertEqual(session.get(self.url).status_code, 200)
+        self.assertEqual(session.stats['retries'], 2)
+
+        Handler.failures = 3
+
+        self.assertEqual(session.get(self.url).status_code, 503)
+        session.close()
+        Handler.failures = 0
+
+    def test_retries_count_against_quota(self):
+        with tempfile.TemporaryDirectory() as d:
+            quota = QuotaCounter(path=os.path.join(d, 'quota.sqlite3'), daily_limit=4)
+            client = AsyncOMDbClient(quota=quota, url=self.url)
+            session = OMDbSession(retries=3, backoff=0)
+            Handler.failures = 2
+
+            with mock.patch('MS_T.omdb.get_session', return_value=session):
+                self.assertEqual(client.get_sync({'i': 'tt1', 'apikey': 'key'}).status_code, 200)
+                self.assertEqual(quota.used('key'), 3)
+
+                # Runs out on the second attempt instead of sending it
+                Handler.failures = 3
+                self.assertRaises(QuotaExceeded, client.get_sync, {'i': 'tt1', 'apikey': 'key'})
+                self.assertEqual(session.stats['requests'], 4)
+
+            Handler.failures = 0
+            session.close()
+            quota.db.close()
+
+class test_limits(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+
+        start = time.monotonic()
+        asyncio.run(take(7))
+
+        # 2 burst tokens, 5 more at 50/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_quota_counter(self):
+        with tempfile.TemporaryDirectory() as d:
+            quota = QuotaCounter(path=os.path.join(d, 'quota.sqlite3'), daily_limit=3)
+            quota.reserve('key-a', 2)
+
+            self.assertEqual(quota.remaining('key-a'), 1)
+            self.assertEqual(quota.remaining('key-b'), 3)
+            self.assertRaises(QuotaExceeded, quota.reserve, 'key-a', 2)
+
+            quota.db.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,528 @@
+import os
+import sys
+import tempfile
+import subprocess
+import gzip
+import time
+import json
+import csv
+import unittest
+from unittest import mock
+import MS_T
+from tests.fake_gspread import FakeSpreadsheet
+from tests.test_index import ROW_TITLES, episode
+
+def spy(fake):
+    writes = []
+    update = fake.values_batch_update
+    fake.values_batch_update = lambda body=None: writes.append(body) or update(body)
+    return writes
+
+def sheet_rows(fake, title):
+    return [r for r in fake.worksheet(title).rows]
+
+class test_load(unittest.TestCase):
+    def test_bulk_load(self):
+        movie = ['Barbie', 'N/A', 'tt1517268', 'N/A', 'movie']
+        fake = FakeSpreadsheet({
+            'Planned': [ROW_TITLES, movie, [episode(1)[t] if t in episode(1) else '' for t in ROW_TITLES]],
+            'Watched': [['Title', 'imdbID'], ['Barbie again', 'tt1517268'], []]
+        })
+        writes = spy(fake)
+
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+
+        self.assertEqual(len(ss.worksheet('Planned').cache), 2)
+        self.assertEqual(ss.worksheet('Planned').cache[1]['Genre'], 'N/A')
+        self.assertEqual(ss.worksheet('Watched').cache, [])
+        self.assertEqual(ss.locate('tt0903747')[0][0].title, 'Planned')
+
+        # Only the mismatched title row is rewritten
+        self.assertEqual([d['range'] for d in writes[0]['data']], ["'Watched'!A1:Z1"])
+
+    def test_skipped_row_rewrites_tail(self):
+        row = lambda n: [episode(n).get(t, 'N/A') for t in ROW_TITLES]
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, row(1), row(1), row(2)]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+
+        ss.save()
+
+        self.assertEqual(sheet_rows(fake, 'Planned'), [ROW_TITLES, row(1), row(2), [''] * 9])
+
+    def test_lazy(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, ['Barbie', 'N/A', 'tt1517268']], 'Watched': [ROW_TITLES]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+
+        self.assertEqual(ss.id, 'fake')
+        self.assertEqual(fake.calls, {})
+
+        self.assertEqual(ss.worksheet('Watched').cache, [])
+        self.assertEqual(ss.worksheet('Planned').cache[0]['Title'], 'Barbie')
+        self.assertEqual({k: v for k, v in fake.calls.items() if not k.startswith('cells')}, {'worksheets': 1, 'get_lastUpdateTime': 1, 'values_batch_get': 1})
+
+    def test_reload_unchanged(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, ['Barbie', 'N/A', 'tt1517268']]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        ss.load()
+        fake.calls.clear()
+
+        ss.load()
+        self.assertEqual(+fake.calls, {'get_lastUpdateTime': 1})
+
+        fake.worksheet('Planned').update('A3', [['Dune', 'N/A', 'tt1160419']])
+        ss.load()
+        self.assertEqual(fake.calls['values_batch_get'], 1)
+        self.assertEqual(len(ss.worksheet('Planned').cache), 2)
+
+    def test_failed_first_load(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, ['Barbie', 'N/A', 'tt1517268']]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        values_batch_get = fake.values_batch_get
+
+        def offline(ranges, params=None):
+            raise ConnectionError('offline')
+
+        fake.values_batch_get = offline
+        self.assertRaises(ConnectionError, ss.ensure_loaded)
+        self.assertFalse(ss.loaded)
+
+        fake.values_batch_get = values_batch_get
+        ss.worksheet('Planned').cache_append(param={'Title': 'Dune', 'imdbID': 'tt1160419', 'Type': 'movie'})
+        ss.save()
+
+        self.assertEqual([r[0] for r in sheet_rows(fake, 'Planned')[1:]], ['Barbie', 'Dune'])
+
+    def test_reload_keeps_unsaved_edits(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, ['Barbie', 'N/A', 'tt1517268']]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        ss.worksheet('Planned').cache_append(param={'Title': 'Dune', 'imdbID': 'tt1160419', 'Type': 'movie'})
+
+        fake.worksheet('Planned').update('B2', [['Monday, January 01, 2024']])
+        self.assertIsNone(ss.load())
+        self.assertEqual([i['Title'] for i in ss.worksheet('Planned').cache], ['Barbie', 'Dune'])
+
+        ss.save()
+        ss.load()
+        self.assertEqual(len(ss.worksheet('Planned').cache), 2)
+
+    def test_gspread_fallback(self):
+        client = mock.Mock()
+        ss = MS_T.Spreadsheet(client=client, API_KEY='test', snapshot_path=None)
+
+        self.assertRaises(AttributeError, getattr, ss, 'missing')
+        self.assertFalse(hasattr(ss, '_ipython_display_'))
+        client.open_by_key.assert_not_called()
+
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+
+        self.assertEqual(ss.get_lastUpdateTime(), fake.get_lastUpdateTime())
+        self.assertRaises(AttributeError, getattr, ss.worksheet('Planned'), '_missing')
+
+    def test_no_eager_imports(self):
+        code = 'import sys, MS_T; print(sorted({"gspread", "requests"} & set(sys.modules)))'
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(out.strip(), '[]')
+
+class test_save(unittest.TestCase):
+    def setUp(self):
+        self.rows = [[f'Movie {n}', 'N/A', f'tt{n:07d}', 'N/A', 'movie', 'N/A', 'N/A', 'N/A', 'N/A'] for n in range(10)]
+        self.fake = FakeSpreadsheet({'Planned': [ROW_TITLES, *self.rows], 'Watched': [ROW_TITLES]})
+        self.ss = MS_T.Spreadsheet(client=object(), spreadsheet=self.fake, API_KEY='test', snapshot_path=None)
+        self.writes = spy(self.fake)
+
+    def test_no_changes(self):
+        self.ss.save()
+
+        self.assertEqual(self.writes, [])
+
+    def test_append_writes_new_row_only(self):
+        self.ss.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        self.ss.save()
+
+        self.assertEqual([d['range'] for d in self.writes[0]['data']], ["'Watched'!A2:I2"])
+        self.assertEqual(sheet_rows(self.fake, 'Watched')[1][0], 'Barbie')
+
+        self.ss.save()
+        self.assertEqual(len(self.writes), 1)
+
+    def test_remove_rewrites_shifted_rows(self):
+        self.ss.worksheet('Planned').cache_remove(param={'imdbID': 'tt0000008'})
+        self.ss.save()
+
+        self.assertEqual([d['range'] for d in self.writes[0]['data']], ["'Planned'!A10:I10", "'Planned'!A11:I11"])
+        self.assertEqual(sheet_rows(self.fake, 'Planned'), [ROW_TITLES, *self.rows[:8], self.rows[9], [''] * 9])
+
+    def test_full_rewrite(self):
+        self.ss.worksheet('Planned').cache_remove(param={'imdbID': 'tt0000000'})
+        self.ss.save()
+
+        self.assertEqual([d['range'] for d in self.writes[0]['data']], ["'Planned'!A2:I10", "'Planned'!A11:I11"])
+
+class test_autosave(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+        self.ss = MS_T.Spreadsheet(client=object(), spreadsheet=self.fake, API_KEY='test', snapshot_path=None)
+        self.ss.ensure_loaded()
+        self.writes = spy(self.fake)
+
+    def tearDown(self):
+        self.ss.disable_autosave()
+
+    def append(self, n):
+        self.ss.worksheet('Planned').cache_append(param={'Title': f'Movie {n}', 'imdbID': f'tt{n:07d}', 'Type': 'movie'})
+
+    def test_flush_after_max_pending(self):
+        self.ss.enable_autosave(interval=60, max_pending=2)
+        self.append(1)
+        self.append(2)
+
+        deadline = time.time() + 5
+
+        while not self.writes and time.time() < deadline:
+            time.sleep(0.01)
+
+        # Both mutations in one coalesced span
+        self.assertEqual([d['range'] for d in self.writes[0]['data']], ["'Planned'!A2:I3"])
+        self.assertEqual(self.ss.autosaver.pending, 0)
+
+    def test_interval(self):
+        self.ss.enable_autosave(interval=0.05, max_pending=100)
+        self.append(1)
+
+        deadline = time.time() + 5
+
+        while not self.writes and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(sheet_rows(self.fake, 'Planned')[1][0], 'Movie 1')
+
+    def test_stop_flushes_pending(self):
+        self.ss.enable_autosave(interval=60, max_pending=100)
+        self.append(1)
+
+        self.assertEqual(self.writes, [])
+
+        self.ss.disable_autosave()
+        self.assertEqual(len(self.writes), 1)
+        self.assertIsNone(self.ss.autosaver)
+
+    def test_backoff_after_failure(self):
+        calls = []
+
+        def offline(changes):
+            calls.append(changes)
+            raise ConnectionError('offline')
+
+        self.ss.backend.write_changes = offline
+        self.ss.enable_autosave(interval=0.05, max_pending=1)
+
+        with mock.patch('builtins.print'):
+            self.append(1)
+            time.sleep(0.5)
+
+            # Waits 0.05, 0.1, 0.2... instead of retrying straight away
+            self.assertLess(len(calls), 6)
+
+        # Back online, stopping flushes
+        del self.ss.backend.write_changes
+        self.ss.disable_autosave()
+        self.assertEqual(sheet_rows(self.fake, 'Planned')[1][0], 'Movie 1')
+
+    def test_clear_all(self):
+        self.append(1)
+        self.ss.save()
+        autosaver = self.ss.enable_autosave(interval=60, max_pending=100)
+
+        with mock.patch('builtins.input', return_value='y'):
+            self.ss.clear_all_data()
+
+        self.assertEqual(autosaver.pending, 1)
+
+        self.ss.disable_autosave()
+        self.assertEqual(sheet_rows(self.fake, 'Planned')[1], [''] * 9)
+
+    def test_save_is_barrier(self):
+        autosaver = self.ss.enable_autosave(interval=60, max_pending=100)
+        self.append(1)
+
+        self.ss.save()
+
+        self.assertEqual(sheet_rows(self.fake, 'Planned')[1][0], 'Movie 1')
+        self.assertEqual(autosaver.pending, 0)
+
+        self.ss.disable_autosave()
+        self.assertEqual(len(self.writes), 1)
+
+class test_shards(unittest.TestCase):
+    def open(self, fake):
+        return MS_T.Spreadsheet(backend=MS_T.GSheetsBackend(client=object(), spreadsheet=fake, shard_rows=3), API_KEY='test', snapshot_path=None)
+
+    def test_spill_and_reload(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+        ss = self.open(fake)
+
+        for n in range(7):
+            ss.worksheet('Planned').cache_append(param=episode(n))
+
+        writes = spy(fake)
+        ss.save()
+
+        self.assertEqual([i.title for i in fake.sheets], ['Planned', 'Watched', 'Planned#2', 'Planned#3'])
+        self.assertEqual(sheet_rows(fake, 'Planned#3')[0][:9], ROW_TITLES)
+        self.assertEqual(sheet_rows(fake, 'Planned#3')[1:], [[episode(6).get(t, 'N/A') for t in ROW_TITLES]])
+        self.assertEqual([d['range'] for d in writes[-1]['data']], ["'Planned'!A2:I4", "'Planned#2'!A2:I4", "'Planned#3'!A2:I2"])
+
+        ss = self.open(fake)
+        self.assertEqual([i.title for i in ss.worksheets], ['Planned', 'Watched'])
+        self.assertEqual([i['eimdbID'] for i in ss.worksheet('Planned').cache], [episode(n)['eimdbID'] for n in range(7)])
+        self.assertEqual(ss.worksheet('Planned').find(param=episode(5), index=True), 5)
+
+        ss.worksheet('Planned').cache_remove(param=episode(5))
+        ss.save()
+
+        self.assertEqual(sheet_rows(fake, 'Planned#2')[3][7], episode(6)['eimdbID'])
+        self.assertEqual(sheet_rows(fake, 'Planned#3')[1], [''] * 9)
+
+    def test_short_shard_keeps_positions(self):
+        row = lambda n: [episode(n).get(t, 'N/A') for t in ROW_TITLES]
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, row(1)], 'Planned#2': [ROW_TITLES, row(4)]})
+        ss = self.open(fake)
+
+        self.assertEqual([i['eimdbID'] for i in ss.worksheet('Planned').cache], [episode(1)['eimdbID'], episode(4)['eimdbID']])
+
+        # Gap rows were skipped, the tail is compacted on save
+        ss.save()
+        self.assertEqual(sheet_rows(fake, 'Planned')[2], row(4))
+
+class test_snapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'snapshot.pickle')
+        self.fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def open(self):
+        return MS_T.Spreadsheet(client=object(), spreadsheet=self.fake, API_KEY='test', snapshot_path=self.path)
+
+    def test_unchanged_spreadsheet_skips_load(self):
+        ss = self.open()
+        ss.worksheet('Planned').cache_append(param=episode(1))
+        ss.save()
+
+        reads = []
+        self.fake.values_batch_get = lambda ranges, params=None: reads.append(ranges)
+        ss = self.open()
+
+        self.assertEqual(reads, [])
+        self.assertEqual(ss.worksheet('Planned').cache[0]['eimdbID'], episode(1)['eimdbID'])
+        self.assertEqual(ss.locate('tt0903747')[0][0].title, 'Planned')
+
+    def test_keeps_pending_layout_fix(self):
+        row = lambda n: [episode(n).get(t, 'N/A') for t in ROW_TITLES]
+        self.fake.worksheet('Planned').rows = [ROW_TITLES, row(1), row(1), row(2), row(3)]
+
+        # Duplicate row skipped, rows from it still to be rewritten
+        self.open().ensure_loaded()
+
+        ss = self.open()
+        ss.worksheet('Planned').cache_update(episode(3), Genre='Drama')
+        ss.save()
+
+        self.assertEqual([r[7] for r in sheet_rows(self.fake, 'Planned')[1:]], [episode(n)['eimdbID'] for n in (1, 2, 3)] + [''])
+        self.assertEqual(sheet_rows(self.fake, 'Planned')[3][8], 'Drama')
+
+    def test_changed_spreadsheet_reloads(self):
+        self.open().ensure_loaded()
+        self.fake.worksheet('Watched').update('A2', [['Barbie', 'N/A', 'tt1517268']])
+
+        self.assertEqual(self.open().worksheet('Watched').cache[0]['Title'], 'Barbie')
+
+class test_sqlite_backend(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'library.sqlite3')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def open(self, mirror=None):
+        backend = MS_T.SQLiteBackend(path=self.path, sheet_titles=['Planned', 'Watched'], mirror=mirror)
+        return MS_T.Spreadsheet(backend=backend, API_KEY='test', snapshot_path=None)
+
+    def test_round_trip(self):
+        ss = self.open()
+        self.assertEqual([i.title for i in ss.worksheets], ['Planned', 'Watched'])
+
+        for n in range(3):
+            ss.worksheet('Planned').cache_append(param=episode(n))
+
+        ss.worksheet('Planned').cache_remove(param={'imdbID': episode(0)['eimdbID']})
+        ss.save()
+        ss.backend.db.close()
+
+        ss = self.open()
+        self.assertEqual([i['eimdbID'] for i in ss.worksheet('Planned').cache], [episode(1)['eimdbID'], episode(2)['eimdbID']])
+        self.assertEqual(ss.locate('tt0903747')[0][0].title, 'Planned')
+
+    def test_incremental_load(self):
+        a = self.open()
+
+        for n in range(3):
+            a.worksheet('Planned').cache_append(param=episode(n))
+
+        a.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        a.save()
+
+        b = self.open()
+        b.worksheet('Watched').cache_append(param={'Title': 'Dune', 'imdbID': 'tt1160419', 'Type': 'movie'})
+        b.save()
+
+        reads = []
+        read_blocks = a.backend.read_blocks
+        a.backend.read_blocks = lambda blocks: reads.append(blocks) or read_blocks(blocks)
+        a.backend.read_all = None
+
+        a.load()
+        self.assertEqual(reads, [{'Watched': [0]}])
+        self.assertEqual([i['Title'] for i in a.worksheet('Watched').cache], ['Barbie', 'Dune'])
+        self.assertEqual(a.locate('tt1160419')[0][0].title, 'Watched')
+
+        # Unchanged, nothing is read
+        a.load()
+        self.assertEqual(len(reads), 1)
+
+        b.worksheet('Planned').cache_remove(param=episode(0))
+        b.save()
+        a.load()
+
+        self.assertEqual(reads[-1], {'Planned': [0]})
+        self.assertEqual([i['eimdbID'] for i in a.worksheet('Planned').cache], [episode(1)['eimdbID'], episode(2)['eimdbID']])
+
+    def test_sync_blocked_by_unsaved_edits(self):
+        a = self.open()
+        a.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        a.save()
+        a.worksheet('Watched').cache_append(param={'Title': 'Oppenheimer', 'imdbID': 'tt15398776', 'Type': 'movie'})
+
+        b = self.open()
+        b.worksheet('Watched').cache_append(param={'Title': 'Dune', 'imdbID': 'tt1160419', 'Type': 'movie'})
+        b.save()
+
+        a.backend.read_all = a.backend.read_blocks = None
+        self.assertIsNone(a.load())
+        self.assertEqual([i['Title'] for i in a.worksheet('Watched').cache], ['Barbie', 'Oppenheimer'])
+
+    def test_mirror(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+        mirror = MS_T.GSheetsBackend(client=object(), spreadsheet=fake)
+
+        ss = self.open(mirror=mirror)
+        ss.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        ss.save()
+
+        self.assertEqual(sheet_rows(fake, 'Watched')[1][:3], ['Barbie', 'N/A', 'tt1517268'])
+
+        fake.worksheet('Watched').rows = [ROW_TITLES]
+        ss.backend.sync_mirror()
+        self.assertEqual(sheet_rows(fake, 'Watched')[1][0], 'Barbie')
+
+    def test_mirror_seeds_empty_database(self):
+        dune = ['Dune', 'N/A', 'tt1160419', 'N/A', 'movie', 'N/A', 'N/A', 'N/A', 'N/A']
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES, [], dune]})
+
+        ss = self.open(mirror=MS_T.GSheetsBackend(client=object(), spreadsheet=fake))
+        self.assertEqual([i['Title'] for i in ss.worksheet('Watched').cache], ['Dune'])
+
+        ss.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+        ss.save()
+
+        # Full rewrite first, so the blank row is gone and nothing is overwritten
+        self.assertEqual([r[0] for r in sheet_rows(fake, 'Watched')[1:] if r], ['Dune', 'Barbie'])
+        self.assertEqual(sheet_rows(fake, 'Watched')[1][0], 'Dune')
+        ss.backend.db.close()
+
+        # Synced mirrors get diffs, and are not read again
+        fake.values_batch_get = None
+        ss = self.open(mirror=MS_T.GSheetsBackend(client=object(), spreadsheet=fake))
+        writes = spy(fake)
+        ss.worksheet('Planned').cache_append(param=episode(1))
+        ss.save()
+
+        self.assertEqual([d['range'] for d in writes[0]['data']], ["'Planned'!A2:I2"])
+        self.assertEqual(sheet_rows(fake, 'Watched')[2][0], 'Barbie')
+
+class test_import(unittest.TestCase):
+    def test_import_file(self):
+        movies = {'barbie': 'tt1517268', 'oppenheimer': 'tt15398776'}
+        calls = []
+
+        def query(params, use_cache=True):
+            calls.append(params)
+            ID = params.get('i') or movies.get(params['t'].lower())
+            return {'Title': ID, 'imdbID': ID, 'Type': 'movie', 'Response': 'True'} if ID else None
+
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES, ['Dune', 'N/A', 'tt1160419']]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        writes = spy(fake)
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'titles.csv')
+
+            with open(path, 'w') as file:
+                file.write('Barbie,barbie,tt1160419\nOppenheimer,Nope,dune\ntt0111161\n')
+
+            with mock.patch('MS_T.importer.query', side_effect=query), mock.patch('MS_T.importer.get_client'):
+                results = MS_T.importer.import_file(ss, ss.worksheet('Planned'), path, policy='review', batch_size=2)
+
+            self.assertTrue(os.path.exists(os.path.join(d, 'titles_failed.csv')))
+
+        self.assertEqual([e['imdbID'] for e in results['imported']], ['tt0111161'])
+        self.assertEqual([r[1] for r in results['review']], ['tt1517268', 'tt15398776'])
+        self.assertEqual(dict(results['failed']), {'barbie': 'duplicate in file', 'tt1160419': 'already tracked', 'dune': 'already tracked', 'Nope': 'not found'})
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(len(writes), 1)
+
+class test_export(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ss = MS_T.Spreadsheet(client=object(), spreadsheet=FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES], 'Canceled': [ROW_TITLES]}), API_KEY='test', snapshot_path=None)
+
+        for n in range(1, 4):
+            self.ss.worksheet('Planned').cache_append(param=episode(n))
+
+        self.ss.worksheet('Watched').cache_append(param={'Title': 'Barbie', 'imdbID': 'tt1517268', 'Type': 'movie'})
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_csv(self):
+        self.assertTrue(self.ss.export_(format='csv', columns=[], compress=False, dir_path=self.dir.name))
+
+        with open(os.path.join(self.dir.name, 'Planned.csv'), newline='') as file:
+            rows = list(csv.reader(file))
+
+        self.assertEqual(rows[0], ROW_TITLES)
+        self.assertEqual([r[7] for r in rows[1:]], [episode(n)['eimdbID'] for n in range(1, 4)])
+        self.assertEqual(sorted(os.listdir(self.dir.name)), ['Planned.csv', 'Watched.csv'])
+
+    def test_jsonl_gzip_filtered(self):
+        results = MS_T.exporter.export_all(
+            self.ss, self.dir.name, format='jsonl', compress=True,
+            columns=['Title', 'eimdbID'], filters={'Type': 'series', 'Episode': lambda v: int(v) > 1}
+        )
+
+        self.assertEqual(results['Planned'][1], 2)
+        self.assertEqual(results['Watched'][1], 0)
+
+        with gzip.open(results['Planned'][0], 'rt') as file:
+            self.assertEqual([json.loads(line) for line in file], [{'Title': episode(n)['Title'], 'eimdbID': episode(n)['eimdbID']} for n in (2, 3)])
+
+    def test_invalid_column(self):
+        self.assertRaises(ValueError, MS_T.exporter.export_all, self.ss, self.dir.name, columns=['Rating'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import MS_T
+from MS_T.stats import get_stats, percentile, payload_size
+from MS_T.cache import QueryCache
+from tests.fake_gspread import FakeSpreadsheet
+from tests.test_index import ROW_TITLES, episode
+
+class test_stats(unittest.TestCase):
+    def setUp(self):
+        get_stats().reset()
+
+    def calls(self):
+        return {(r['call'], r['operation']): r for r in get_stats().summary()}
+
+    def test_sheets_calls_tagged(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES], 'Watched': [ROW_TITLES]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        ss.worksheet('Planned').cache_append(param=episode(1))
+        ss.save()
+
+        calls = self.calls()
+        self.assertEqual(calls[('spreadsheet.values_batch_get', 'load')]['count'], 1)
+        self.assertEqual(calls[('spreadsheet.values_batch_update', 'save')]['count'], 1)
+        self.assertGreater(calls[('spreadsheet.values_batch_update', 'save')]['bytes'], len(episode(1)['eimdbID']))
+        self.assertEqual(calls[('operation', 'save')]['count'], 1)
+
+    def test_errors_counted(self):
+        fake = FakeSpreadsheet({'Planned': [ROW_TITLES]})
+        ss = MS_T.Spreadsheet(client=object(), spreadsheet=fake, API_KEY='test', snapshot_path=None)
+        fake.values_batch_update = mock.Mock(side_effect=ConnectionError)
+        ss.worksheet('Planned').cache_append(param=episode(1))
+
+        with self.assertRaises(ConnectionError):
+            ss.save()
+
+        self.assertEqual(self.calls()[('spreadsheet.values_batch_update', 'save')]['errors'], 1)
+
+    def test_query_calls(self):
+        client = mock.Mock()
+        client.get_sync.return_value = mock.Mock(status_code=200, json=lambda: {'Response': 'False', 'Error': 'Movie not found!'})
+
+        with tempfile.TemporaryDirectory() as d:
+            cache = QueryCache(path=os.path.join(d, 'cache.sqlite3'))
+
+            with mock.patch('MS_T.utils.get_client', return_value=client), mock.patch('MS_T.utils.get_query_cache', return_value=cache):
+                MS_T.utils.query({'t': 'nothing', 'apikey': 'test'}, use_cache=False)
+
+            cache.db.close()
+
+        self.assertEqual(self.calls()[('omdb.query', '-')]['errors'], 1)
+
+    def test_percentiles_and_dump(self):
+        for n in range(1, 101):
+            get_stats().record('call', n / 1000, op='op')
+
+        row = self.calls()[('call', 'op')]
+        self.assertEqual((row['p50'], row['p95'], row['p99']), (0.05, 0.095, 0.099))
+        self.assertEqual(percentile([], 50), None)
+        self.assertEqual(payload_size({'a': ['bc', 1]}), 4)
+
+        with tempfile.TemporaryDirectory() as d:
+            with open(get_stats().dump(os.path.join(d, 'stats.json'))) as file:
+                self.assertEqual(json.load(file)['calls'][0]['count'], 100)
+
+if __name__ == '__main__':
+    unittest.main()